@@ -1,5 +1,6 @@
 from Objects import Circle
 from SurvivalRL import Config, GameObject
+from SurvivalRL.entities import HERBIVORE
 
 import matplotlib.patches as patches
 import matplotlib
@@ -7,42 +8,33 @@ import numpy as np
 
 
 class Herbivore(Circle):
-    
+
+    __slots__ = ()
+    KIND = HERBIVORE
+
     def __init__(self, game, ax, x, y, radius, target_speed, colour, name = None):
         super().__init__(game, ax, x, y, radius, target_speed, colour, name)
+        self.energy = Config.HERBIVORE_ENERGY
         self.set_new_target()
 
     def update(self, fps, grid):
         """
-        Updates the circle's position by moving it towards its target.
+        Moves the circle's artists to the position computed by the game step.
 
-        The circle moves in both x and y directions based on its target.
-        If a collision is detected, the movement is adjusted accordingly.
+        The circle is drawn red while it collides with another object, and the
+        direction arrow follows the movement of the last frame.
 
         Args:
             fps (int): The frames per second for movement calculations.
-            objects (list): A list of all objects in the scene.
-            grid (dict): The spatial partitioning grid for optimized collision detection.
+            grid (SpatialHash): The spatial hash used for collision detection.
         """
-        prev_x, prev_y = self.pos.x, self.pos.y
-        max_speed = self.target_speed * (60 / fps)
-        reached_target = self.pos.move_towards(self.target_x, self.target_y, max_speed)
-
-        if reached_target:
-            self.set_new_target()
-
-        cell_x, cell_y = self.get_grid_cell()
-        possible_collisions = grid.get((cell_x, cell_y), [])
-
-        for other in possible_collisions:
-            if other is not self and self.is_colliding(other):
-                self.resolve_collision(other)
-                self.shape.set_color("red")
-            else:
-                self.shape.set_color(self.colour)
+        if self.game.collided[self.index]:
+            self.shape.set_color("red")
+        else:
+            self.shape.set_color(self.colour)
 
-        dx = self.pos.x - prev_x
-        dy = self.pos.y - prev_y
+        dx = float(self.game.entities.vx[self.index])
+        dy = float(self.game.entities.vy[self.index])
         direction_length = np.hypot(dx, dy)
 
         if direction_length > 0.01:
@@ -57,37 +49,13 @@ class Herbivore(Circle):
         self.shape.set_center(self.pos())
         self.label.set_position((self.pos.x, self.pos.y + self.radius + 0.5))
 
-    def set_new_target(self):
-        """ 
-        Sets a new random target position within a reasonable distance.
-        
-        Ensures that the new target is not too close to the current position.
-        """
-        while True:
-            new_x = np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2)
-            new_y = np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2)
-            distance = np.hypot(new_x - self.pos.x, new_y - self.pos.y)
-
-            if distance > Config.MIN_TARGET_DISTANCE:
-                self.target_x = new_x
-                self.target_y = new_y
-                break
-
     def division(self):
         """
         Divide Cells
+
+        Spawns a new herbivore next to this one and gives it half of the energy.
+
+        Returns:
+            int: Slot of the new herbivore.
         """
-        self.game.add_object(Circle(
-            game=self.game,
-            ax=self.ax,
-            x=np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2),
-            y=np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2),
-            radius=1,
-            target_speed=np.random.uniform(0.1, 0.3),
-            colour=np.random.choice(["blue", "green", "purple", "orange"]),
-            name=f"Clone Cell"
-        ))
-        
-    def resolve_collision(self, other):
-        super().resolve_collision(other)
-        self.set_new_target()
\ No newline at end of file
+        return int(self.game.divide([self.index])[0])
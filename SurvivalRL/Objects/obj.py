@@ -1,25 +1,45 @@
-import matplotlib
+import matplotlib.axes
 import numpy as np
 
 from SurvivalRL import GameObject
+from SurvivalRL.entities import EntityTable
+from SurvivalRL.physics import narrowphase, resolve
 
 
 class Position:    
     """ 
-    A simple class to store and manage 2D positions. 
+    A view of an entity's 2D position inside an `EntityTable`. 
     This class allows retrieving and updating position values.
     """
 
-    def __init__(self, x: float, y: float):
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: EntityTable, index: int):
         """
-        Initializes a Position object with x and y coordinates.
+        Initializes a Position view onto one row of the table.
 
         Args:
-            x (float): Initial x-coordinate.
-            y (float): Initial y-coordinate.
+            table (EntityTable): The table holding the entity.
+            index (int): Slot of the entity in the table.
         """
-        self.x = x
-        self.y = y
+        self.table = table
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.table.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.table.x[self.index] = value
+
+    @property
+    def y(self):
+        return float(self.table.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.table.y[self.index] = value
 
     def __call__(self):
         """
@@ -78,6 +98,11 @@ class Obj:
     This class provides a base for different graphical objects that can be drawn and updated.
     """
 
+    # Objects are small handles onto `game.entities`; artists only exist while the game has an axis
+    __slots__ = ("game", "index", "pos", "colour", "name", "shape", "label", "direction_arrow")
+
+    KIND = None  # Entity kind, defined in the subclasses
+
     def __init__(
         self, 
         game: GameObject, 
@@ -89,19 +114,123 @@ class Obj:
         """
         Initializes an Obj with a position and color.
 
+        The entity is spawned into `game.entities`; the object only keeps its slot.
+
         Args:
+            ax (matplotlib.axes.Axes): Kept for compatibility, objects are drawn on `game.ax`.
             x (float): Initial x-coordinate of the object.
             y (float): Initial y-coordinate of the object.
             colour (str): Color of the object.
         """
+        index = int(game.entities.spawn(self.KIND, x, y, target_speed=target_speed)[0])
+        self._bind(game, index, colour, name)
+
+    def _bind(self, game, index, colour, name):
+        """ Points the object at an existing row of `game.entities`. """
         self.game = game
-        self.ax = ax
-        self.pos = Position(x, y)
-        self.target_speed = target_speed
+        self.index = index
+        self.pos = Position(game.entities, index)
         self.colour = colour
         self.shape = None # Shape will be defined in the subclasses
-        if name is not None:
-            self.name = name
+        self.label = None
+        self.direction_arrow = None
+        self.name = name
+
+    @classmethod
+    def attach(cls, game: GameObject, index: int, colour: str, name: str = None):
+        """
+        Creates an object for an entity that is already in `game.entities`.
+
+        Used for entities spawned in bulk, which have no object until they need to be drawn.
+
+        Args:
+            game (GameObject): The game owning the entity.
+            index (int): Slot of the entity.
+            colour (str): Color of the object.
+            name (str, optional): Name label of the object.
+
+        Returns:
+            Obj: The new object, not yet drawn.
+        """
+        obj = cls.__new__(cls)
+        obj._bind(game, index, colour, name)
+        return obj
+
+    @property
+    def ax(self):
+        """ The axis the object is drawn on, None while the game has no renderer. """
+        return self.game.ax
+
+    @property
+    def energy(self):
+        return float(self.game.entities.energy[self.index])
+
+    @energy.setter
+    def energy(self, value):
+        self.game.entities.energy[self.index] = value
+
+    @property
+    def target_speed(self):
+        return float(self.game.entities.target_speed[self.index])
+
+    @target_speed.setter
+    def target_speed(self, value):
+        self.game.entities.target_speed[self.index] = value
+
+    @property
+    def target_x(self):
+        return float(self.game.entities.target_x[self.index])
+
+    @target_x.setter
+    def target_x(self, value):
+        self.game.entities.target_x[self.index] = value
+
+    @property
+    def target_y(self):
+        return float(self.game.entities.target_y[self.index])
+
+    @target_y.setter
+    def target_y(self, value):
+        self.game.entities.target_y[self.index] = value
+
+    def set_new_target(self):
+        """ 
+        Sets a new random target position within a reasonable distance.
+        
+        Ensures that the new target is not too close to the current position.
+        """
+        self.game.retarget(np.array([self.index]))
+
+    def is_colliding(self, other):
+        """
+        Checks if this object overlaps another, with the test used by the game step.
+
+        Args:
+            other (Obj): Another object in the scene.
+
+        Returns:
+            bool: True if a collision is detected, False otherwise.
+        """
+        hit, _, _, _ = narrowphase(self.game.entities, np.array([self.index]), np.array([other.index]))
+        return bool(hit[0])
+
+    def resolve_collision(self, other):
+        """
+        Pushes this object and another apart, as the game step does, and gives the moving
+        ones a new target.
+
+        Args:
+            other (Obj): The object that this one has collided with.
+        """
+        table = self.game.entities
+        i, j = np.array([self.index]), np.array([other.index])
+        hit, normal_x, normal_y, depth = narrowphase(table, i, j)
+        if not hit[0]:
+            return
+
+        resolve(table, i, j, normal_x, normal_y, depth)
+        pair = np.array([self.index, other.index])
+        self.game.retarget(pair[table.target_speed[pair] > 0])
 
     def draw(self):
         """
@@ -117,6 +246,13 @@ class Obj:
         """
         raise NotImplementedError
 
+    def remove(self):
+        """ Removes every artist of the object from the axis. """
+        for artist in (self.shape, self.label, self.direction_arrow):
+            if artist is not None:
+                artist.remove()
+        self.shape = self.label = self.direction_arrow = None
+
     def update(self):
         """
         Abstract method to update the object's position based on the current frame.
@@ -1,5 +1,6 @@
 from Objects import Circle
 from SurvivalRL import Config, GameObject
+from SurvivalRL.entities import PLANT
 
 import matplotlib.patches as patches
 import matplotlib
@@ -8,24 +9,20 @@ import numpy as np
 
 class Plant(Circle):
     
+    __slots__ = ()
+    KIND = PLANT
+
     def __init__(self, game, ax, x, y, radius, colour, name = None):
         super().__init__(game, ax, x, y, radius, 0, colour, name)
-    
-    def update(self, fps, grid):
-        self.shape.set_center(self.pos())
-        self.label.set_position((self.pos.x, self.pos.y + self.radius + 0.5))
+        self.energy = Config.PLANT_ENERGY
 
     def division(self):
         """
         Divide Cells
+
+        Spawns a new plant next to this one and gives it half of the energy.
+
+        Returns:
+            int: Slot of the new plant.
         """
-        self.game.add_object(Circle(
-            game=self.game,
-            ax=self.ax,
-            x=np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2),
-            y=np.random.uniform(-Config.WINDOW_SIZE / 2, Config.WINDOW_SIZE / 2),
-            radius=1,
-            target_speed=np.random.uniform(0.1, 0.3),
-            colour=np.random.choice(["blue", "green", "purple", "orange"]),
-            name=f"Clone Cell"
-        ))
\ No newline at end of file
+        return int(self.game.divide([self.index])[0])
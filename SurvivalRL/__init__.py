@@ -4,5 +4,12 @@ from sys import path
 path.insert(0, dirname(__file__))
 
 from .config import Config
+from .spatial_hash import SpatialHash
+from .entities import EntityTable
+from .events import CollisionEvents
 from .game_object import GameObject
+from .domain import TiledWorld
+from .control import ControlInterface
+from .recording import Recorder, Recording
+from .telemetry import TelemetryLog, Telemetry
 from Objects import *
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""
+Benchmark regression gate.
+
+Runs a fixed set of seeded, headless scenarios through `GameObject.update` and compares
+their throughput (steps per second) and peak traced memory against a committed baseline.
+The command exits with status 1 and prints the differing rows when a scenario is slower,
+or uses more memory, than the baseline allows, or when a scenario no longer ends with
+the same population as in the baseline (drift: the scenario or the simulation changed).
+
+    $ python3 -m SurvivalRL.benchmark            # compare against benchmarks/baseline.json
+    $ python3 -m SurvivalRL.benchmark --update   # record a new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from SurvivalRL import GameObject
+from SurvivalRL.entities import CIRCLE, RECTANGLE, HERBIVORE, PLANT
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "baseline.json")
+FPS = 30
+
+
+def _field(game, kind, count, spread, speed=(0.1, 0.2), **fields):
+    """ Spawns entities uniformly over a square of the given edge length. """
+    x = np.random.uniform(-spread / 2, spread / 2, count)
+    y = np.random.uniform(-spread / 2, spread / 2, count)
+    speed = np.random.uniform(*speed, count) if speed else 0.0
+    slots = game.entities.spawn(kind, x, y, target_speed=speed, **fields)
+    game.retarget(slots[game.entities.target_speed[slots] > 0])
+
+
+def sparse_field(game):
+    """ Few contacts: small circles spread over a large world. """
+    _field(game, CIRCLE, 4000, game.world_size, radius=0.5)
+
+
+def dense_herd(game):
+    """ Many contacts: herbivores packed into the centre of the world. """
+    _field(game, HERBIVORE, 4000, game.world_size / 4, radius=1.0)
+
+
+def rectangle_heavy(game):
+    """ Mostly rectangles, which take the box paths of the narrowphase and the sweep. """
+    _field(game, RECTANGLE, 3000, game.world_size,
+           width=np.random.uniform(1, 3, 3000), height=np.random.uniform(1, 3, 3000))
+    _field(game, CIRCLE, 1000, game.world_size, radius=0.5)
+
+
+def plant_heavy(game):
+    """ The ecology at work: a meadow of plants grazed by a few herbivores. """
+    _field(game, PLANT, 6000, game.world_size, speed=None, radius=0.5, energy=10.0)
+    _field(game, HERBIVORE, 300, game.world_size, radius=1.0, energy=50.0)
+
+
+# name: (builder, world size, ecology, steps)
+SCENARIOS = {
+    "sparse_field": (sparse_field, 600.0, False, 60),
+    "dense_herd": (dense_herd, 400.0, False, 30),
+    "rectangle_heavy": (rectangle_heavy, 300.0, False, 40),
+    "plant_heavy": (plant_heavy, 400.0, True, 60),
+}
+
+
+_CALIBRATION_DATA = np.random.default_rng(0).random(200000)
+
+
+def _calibration_kernel():
+    """ A fixed amount of numpy work, timed next to the steps to gauge the speed of the machine. """
+    np.sort(_CALIBRATION_DATA)
+    np.hypot(_CALIBRATION_DATA, _CALIBRATION_DATA)
+    np.argsort(_CALIBRATION_DATA[:50000])
+
+
+def _build(name, seed):
+    builder, world_size, ecology, _ = SCENARIOS[name]
+    np.random.seed(seed)
+    game = GameObject(None, world_size=world_size, ecology=ecology)
+    builder(game)
+    return game
+
+
+def run_scenario(name, seed: int = 0, repeats: int = 3, warmup: int = 5):
+    """
+    Measures one scenario.
+
+    Every step of several runs from the same seeded start is timed, and the throughput
+    is taken from the median step so that bursts of load on the machine do not count.
+    A fixed calibration kernel is timed after every step; its rate is kept alongside so
+    that `compare` can correct for a machine that is slower or busier than the one the
+    baseline was recorded on. Peak memory is traced in a separate run, since tracing
+    slows the steps down.
+
+    Args:
+        name (str): Key of `SCENARIOS`.
+        seed (int, optional): Seed of the numpy random state.
+        repeats (int, optional): Number of timed runs.
+        warmup (int, optional): Untimed steps before each run, so that the spatial hash
+            is tuned and the buffers are allocated.
+
+    Returns:
+        dict: `steps_per_sec`, the `calibration` kernel runs per second, `peak_memory` in
+            bytes and the number of live `entities` at the end.
+    """
+    steps = SCENARIOS[name][3]
+
+    step_times, kernel_times = [], []
+    for _ in range(repeats):
+        game = _build(name, seed)
+        for _ in range(warmup):
+            game.update(FPS)
+        for _ in range(steps):
+            started = time.perf_counter()
+            game.update(FPS)
+            step_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            _calibration_kernel()
+            kernel_times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        game = _build(name, seed)
+        for _ in range(warmup + steps):
+            game.update(FPS)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"steps_per_sec": 1 / np.median(step_times), "calibration": 1 / np.median(kernel_times),
+            "peak_memory": peak, "entities": len(game.entities)}
+
+
+def run_all(names=None, seed: int = 0, repeats: int = 3, runs: int = 1):
+    """
+    Measures several scenarios, over one or more full runs.
+
+    The runs are interleaved so that a slow spell of the machine is spread over all the
+    scenarios. For each scenario the run with the median calibrated throughput is kept.
+
+    Args:
+        names (list, optional): Scenario names. Defaults to all of `SCENARIOS`.
+        seed (int, optional): Seed of the numpy random state.
+        repeats (int, optional): Number of timed runs per scenario.
+        runs (int, optional): Number of full runs.
+
+    Returns:
+        dict: Results of `run_scenario` by scenario name.
+    """
+    names = list(names or SCENARIOS)
+    measured = {name: [] for name in names}
+    for _ in range(runs):
+        for name in names:
+            measured[name].append(run_scenario(name, seed, repeats))
+
+    results = {}
+    for name, candidates in measured.items():
+        candidates.sort(key=lambda result: result["steps_per_sec"] / result["calibration"])
+        results[name] = candidates[len(candidates) // 2]
+    return results
+
+
+def compare(baseline, results, tolerance: float = 0.15, memory_tolerance: float = 0.10):
+    """
+    Compares measured results with a baseline.
+
+    Measured steps per second are scaled by the ratio of the baseline and current
+    calibration rates before they are compared, so the comparison holds on a machine
+    of a different speed. The number of live entities at the end of a scenario must
+    match exactly; when it does not, the scenario or the simulation itself changed, and
+    its timings are reported as drift rather than as a regression.
+
+    Args:
+        baseline (dict): Results by scenario name, as stored in the baseline file.
+        results (dict): Results by scenario name, as returned by `run_all`.
+        tolerance (float, optional): Allowed relative drop of steps per second.
+        memory_tolerance (float, optional): Allowed relative growth of peak memory.
+
+    Returns:
+        list: One row per scenario and metric: (scenario, metric, baseline, current,
+            relative change, status), the status being "ok", "REGRESSED", "DRIFT"
+            (different entity count), "drift" (timings of a drifted scenario) or "new".
+    """
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.extend((name, metric, None, result[metric], None, "new")
+                        for metric in ("entities", "steps_per_sec", "peak_memory"))
+            continue
+
+        drifted = result["entities"] != reference["entities"]
+        rows.append((name, "entities", reference["entities"], result["entities"],
+                     result["entities"] / max(1, reference["entities"]) - 1, "DRIFT" if drifted else "ok"))
+        for metric, limit, sign in (("steps_per_sec", tolerance, -1), ("peak_memory", memory_tolerance, 1)):
+            current = result[metric]
+            if metric == "steps_per_sec":
+                current *= reference["calibration"] / result["calibration"]
+            change = current / reference[metric] - 1
+            if drifted:
+                status = "drift"
+            else:
+                status = "REGRESSED" if sign * change > limit else "ok"
+            rows.append((name, metric, reference[metric], current, change, status))
+    return rows
+
+
+def _format(metric, value):
+    if value is None:
+        return "-"
+    if metric == "peak_memory":
+        return f"{value / 2**20:.1f} MiB"
+    if metric == "entities":
+        return str(value)
+    return f"{value:.1f}"
+
+
+def format_rows(rows):
+    """ Lays the rows returned by `compare` out as a text table. """
+    lines = [f"{'scenario':<16} {'metric':<14} {'baseline':>12} {'current':>12} {'change':>8}  status"]
+    for name, metric, reference, current, change, status in rows:
+        shown = "-" if change is None else f"{change:+.1%}"
+        lines.append(f"{name:<16} {metric:<14} {_format(metric, reference):>12} "
+                     f"{_format(metric, current):>12} {shown:>8}  {status}")
+    return "\n".join(lines)
+
+
+def load_baseline(path):
+    """
+    Reads a baseline file.
+
+    Args:
+        path (str): Path of a file written by `save_baseline`.
+
+    Returns:
+        dict: Results by scenario name.
+    """
+    with open(path) as file:
+        return json.load(file)["scenarios"]
+
+
+def save_baseline(path, results, seed: int = 0, runs: int = 1):
+    """
+    Writes measured results as the new baseline, with a note of the machine they come from.
+
+    Args:
+        path (str): Output path.
+        results (dict): Results by scenario name, as returned by `run_all`.
+        seed (int, optional): Seed the results were measured with.
+        runs (int, optional): Number of full runs the results are the median of.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = {
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()},
+        "seed": seed,
+        "runs": runs,
+        "scenarios": results,
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=4)
+        file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check SurvivalRL step throughput against a stored baseline.")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file (default: benchmarks/baseline.json)")
+    parser.add_argument("--update", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Run only these scenarios")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed drop of steps/sec (default: 0.15)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="Allowed growth of peak memory (default: 0.10)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per scenario and full run")
+    parser.add_argument("--runs", type=int, default=None,
+                        help="Full runs, the median one is kept (default: 5 with --update, else 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    runs = args.runs or (5 if args.update else 3)
+    results = run_all(args.scenario, args.seed, args.repeats, runs)
+
+    if args.update:
+        if args.scenario and os.path.exists(args.baseline):
+            results = {**load_baseline(args.baseline), **results}
+        save_baseline(args.baseline, results, args.seed, runs)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, record one with --update", file=sys.stderr)
+        return 2
+
+    rows = compare(load_baseline(args.baseline), results, args.tolerance, args.memory_tolerance)
+    print(format_rows(rows))
+
+    drifted = [row for row in rows if row[-1] == "DRIFT"]
+    regressed = [row for row in rows if row[-1] == "REGRESSED"]
+    if drifted:
+        print(f"\n{len(drifted)} scenario(s) ended with a different population than the baseline; "
+              f"the scenarios or the simulation changed, record a new baseline with --update", file=sys.stderr)
+    if regressed:
+        print(f"\n{len(regressed)} regression(s) beyond tolerance", file=sys.stderr)
+    return 1 if drifted or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,16 @@ from dataclasses import dataclass
 class Config:
     WINDOW_SIZE: int = 40
     GRID_SIZE: int = 10
-    MIN_TARGET_DISTANCE: int = 5
\ No newline at end of file
+    GRID_AUTO_TUNE: bool = True
+    GRID_RETUNE_INTERVAL: int = 120
+    MIN_TARGET_DISTANCE: int = 5
+
+    # Ecology, rates are per simulated second
+    HERBIVORE_ENERGY: float = 50.0
+    HERBIVORE_METABOLISM: float = 2.0
+    HERBIVORE_DIVISION_ENERGY: float = 100.0
+    EAT_RATE: float = 30.0
+    PLANT_ENERGY: float = 20.0
+    PLANT_GROWTH: float = 2.0
+    PLANT_DIVISION_ENERGY: float = 40.0
+    PLANT_DENSITY: float = 0.02  # Carrying capacity, plants per unit of area
@@ -0,0 +1,143 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from SurvivalRL import Config
+from SurvivalRL.entities import HERBIVORE, PLANT
+
+
+class ControlInterface:
+    """
+    Preallocated action and observation buffers shared between a world and a policy.
+
+    The policy writes one action row per agent into `actions`; the next `GameObject.step`
+    reads it in place. At the end of every step the world writes one observation row per
+    agent into `observations`, which is returned as a view, never a copy. Row `k` of both
+    buffers belongs to the entity in slot `agents[k]`, and the mapping only changes inside
+    a step.
+
+    Agents beyond the buffer capacity keep following random waypoints.
+    """
+
+    MODES = ("target", "velocity")
+    OBSERVATION_FIELDS = (
+        "x", "y", "vx", "vy", "energy",
+        "plant_dx", "plant_dy", "herbivore_dx", "herbivore_dy",
+    )
+
+    def __init__(self, game, kind: int = HERBIVORE, capacity: int = 1024, mode: str = "target",
+                 actions: np.ndarray = None, observations: np.ndarray = None):
+        """
+        Creates the buffers and attaches them to a game.
+
+        Args:
+            game (GameObject): The world to control.
+            kind (int, optional): Kind of the controllable entities.
+            capacity (int, optional): Maximum number of controlled agents.
+            mode (str, optional): "target" for absolute target positions, or "velocity" for
+                a direction scaled by the agent's speed (norm clipped to 1).
+            actions (np.ndarray, optional): A (capacity, 2) buffer to read actions from,
+                e.g. memory shared with an inference process. Allocated when omitted.
+            observations (np.ndarray, optional): A (capacity, len(OBSERVATION_FIELDS)) buffer
+                to write observations into. Allocated when omitted.
+
+        Raises:
+            ValueError: If the mode is unknown or a given buffer has the wrong shape.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown control mode {mode!r}, expected one of {self.MODES}")
+
+        width = len(self.OBSERVATION_FIELDS)
+        if actions is None:
+            actions = np.zeros((capacity, 2), dtype=np.float32)
+        if observations is None:
+            observations = np.zeros((capacity, width), dtype=np.float32)
+        if actions.shape != (capacity, 2):
+            raise ValueError(f"Action buffer must have shape {(capacity, 2)}, got {actions.shape}")
+        if observations.shape != (capacity, width):
+            raise ValueError(f"Observation buffer must have shape {(capacity, width)}, got {observations.shape}")
+
+        self.game = game
+        self.kind = kind
+        self.capacity = capacity
+        self.mode = mode
+        self.actions = actions
+        self._observations = observations
+        self._agents = np.full(capacity, -1, dtype=np.int64)
+        self.count = 0
+
+        game.controller = self
+        self.observe()
+
+    @property
+    def agents(self):
+        """ Slots of the controlled agents, one per buffer row. """
+        return self._agents[:self.count]
+
+    @property
+    def observations(self):
+        """ View of the observation rows of the current agents. """
+        return self._observations[:self.count]
+
+    def apply(self, fps):
+        """
+        Applies the actions to the agents, called by the world at the start of a step.
+
+        Args:
+            fps (int): The frames per second for movement calculations.
+
+        Returns:
+            np.ndarray: Slots of the agents that are driven by the policy this step.
+        """
+        table = self.game.entities
+        rows = np.flatnonzero(table.alive[self.agents])
+        agents = self.agents[rows]
+        action = self.actions[rows].astype(np.float64)
+
+        if self.mode == "target":
+            half = self.game.world_size / 2
+            table.target_x[agents] = np.clip(action[:, 0], -half, half)
+            table.target_y[agents] = np.clip(action[:, 1], -half, half)
+        else:
+            norm = np.maximum(np.hypot(action[:, 0], action[:, 1]), 1.0)
+            speed = table.target_speed[agents] * (60 / fps) / norm
+            table.x[agents] += action[:, 0] * speed
+            table.y[agents] += action[:, 1] * speed
+        return agents
+
+    def observe(self):
+        """ Picks the agents for the next step and writes their observations, called by the world at the end of a step. """
+        table = self.game.entities
+        owned = table.owned()
+        kind = table.kind[owned]
+
+        agents = owned[kind == self.kind][:self.capacity]
+        self.count = len(agents)
+        self._agents[:self.count] = agents
+        self._agents[self.count:] = -1
+        if self.count == 0:
+            return
+
+        half = self.game.world_size / 2
+        obs = self._observations[:self.count]
+        obs[:, 0] = table.x[agents] / half
+        obs[:, 1] = table.y[agents] / half
+        obs[:, 2] = table.vx[agents]
+        obs[:, 3] = table.vy[agents]
+        obs[:, 4] = table.energy[agents] / Config.HERBIVORE_DIVISION_ENERGY
+        obs[:, 5:7] = self._nearest(agents, owned[kind == PLANT], exclude_self=False)
+        obs[:, 7:9] = self._nearest(agents, owned[kind == HERBIVORE], self.kind == HERBIVORE)
+
+    def _nearest(self, agents, others, exclude_self):
+        """ Offsets from each agent to the closest entity of `others`, zero when there is none. """
+        table = self.game.entities
+        k = 2 if exclude_self else 1
+        if len(others) < k:
+            return 0.0
+
+        points = np.column_stack(table.centers(agents))
+        _, found = cKDTree(np.column_stack(table.centers(others))).query(points, k=k)
+        if exclude_self:
+            found = found[:, 1]
+        nearest = others[found]
+        cx, cy = table.centers(nearest)
+        return np.column_stack([cx - points[:, 0], cy - points[:, 1]])
@@ -0,0 +1,443 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from threading import BrokenBarrierError
+
+import numpy as np
+
+from SurvivalRL import GameObject
+from SurvivalRL.entities import EntityTable
+
+
+class _Exchange:
+    """
+    The shared memory used by the tile workers to trade records.
+
+    Each tile owns two outboxes: a halo outbox (border entities, copied as ghosts by the
+    tiles they can reach) and a migration outbox (entities that left the tile during the
+    last step). Every outbox is a shared memory segment of its own, written only by its
+    tile. When the records do not fit, the writer moves them to a larger segment of the
+    next generation; the record counts, generations and capacities live in a small
+    control block, from which the readers learn to reattach.
+    """
+
+    BOXES = ("halo", "migrants")
+
+    def __init__(self, name: str = None, tiles: int = None, capacity: int = None):
+        """
+        Creates the exchange when a capacity is given, else attaches to an existing one.
+
+        Args:
+            name (str, optional): Name of the control block of an existing exchange.
+            tiles (int): Number of tiles.
+            capacity (int, optional): Initial number of records per outbox.
+        """
+        create = capacity is not None
+        self._control = shared_memory.SharedMemory(name=name, create=create, size=3 * 2 * tiles * 8)
+        self.name = self._control.name
+        self.count, self.generation, self.capacity = np.ndarray((3, 2, tiles), dtype=np.int64,
+                                                                buffer=self._control.buf)
+        self._segments = {}  # (box, tile) -> (generation, segment, records)
+
+        if create:
+            self.count[:] = 0
+            self.generation[:] = 0
+            self.capacity[:] = capacity
+            for box in range(len(self.BOXES)):
+                for tile in range(tiles):
+                    self._attach(box, tile, create=True)
+
+    def _segment_name(self, box, tile, generation):
+        return f"{self.name}_{self.BOXES[box][0]}{tile}_{generation}"
+
+    def _attach(self, box, tile, create=False):
+        generation, capacity = self.generation[box, tile], self.capacity[box, tile]
+        segment = shared_memory.SharedMemory(name=self._segment_name(box, tile, generation), create=create,
+                                             size=max(1, capacity * EntityTable.RECORD_WIDTH * 8))
+        records = np.ndarray((capacity, EntityTable.RECORD_WIDTH), dtype=np.float64, buffer=segment.buf)
+        self._segments[box, tile] = (generation, segment, records)
+        return records
+
+    def _records(self, box, tile):
+        cached = self._segments.get((box, tile))
+        if cached is not None and cached[0] == self.generation[box, tile]:
+            return cached[2]
+        if cached is not None:
+            self._detach(box, tile)
+        return self._attach(box, tile)
+
+    def _detach(self, box, tile, unlink=False):
+        _, segment, _ = self._segments.pop((box, tile))
+        segment.close()
+        if unlink:
+            segment.unlink()
+
+    def write(self, box, tile, records):
+        """
+        Replaces the records of an outbox, growing it when they do not fit.
+
+        Args:
+            box (str): One of `BOXES`.
+            tile (int): The tile owning the outbox; only it may write there.
+            records (np.ndarray): Packed records.
+        """
+        box = self.BOXES.index(box)
+        if len(records) > self.capacity[box, tile]:
+            self._records(box, tile)
+            self._detach(box, tile, unlink=True)
+            self.generation[box, tile] += 1
+            self.capacity[box, tile] = max(2 * self.capacity[box, tile], len(records))
+            self._attach(box, tile, create=True)
+
+        self._records(box, tile)[:len(records)] = records
+        self.count[box, tile] = len(records)
+
+    def read(self, box, tile):
+        """ Returns a view of the records last written to an outbox. """
+        box = self.BOXES.index(box)
+        return self._records(box, tile)[:self.count[box, tile]]
+
+    def close(self, unlink=False):
+        """
+        Detaches from every segment.
+
+        Args:
+            unlink (bool, optional): Also frees the current segments and the control
+                block; done once, by the process that created the exchange.
+        """
+        for box, tile in list(self._segments):
+            self._detach(box, tile)
+        if unlink:
+            for box in range(len(self.BOXES)):
+                for tile in range(self.count.shape[1]):
+                    self._attach(box, tile)
+                    self._detach(box, tile, unlink=True)
+
+        del self.count, self.generation, self.capacity
+        self._control.close()
+        if unlink:
+            self._control.unlink()
+
+
+def _record_bounds(records):
+    """ Bounding boxes of packed records, as `EntityTable.bounds` computes them. """
+    x, y, radius, width, height = (records[:, 1 + EntityTable.FIELDS.index(field)]
+                                   for field in ("x", "y", "radius", "width", "height"))
+    return np.column_stack([x - radius, y - radius, x + radius + width, y + radius + height])
+
+
+class _TileLayout:
+    """ Maps world positions onto a regular grid of tiles. """
+
+    def __init__(self, world_size: float, tiles: tuple):
+        self.world_size = world_size
+        self.nx, self.ny = tiles
+        self.tile_w = world_size / self.nx
+        self.tile_h = world_size / self.ny
+
+    def __len__(self):
+        return self.nx * self.ny
+
+    def tile_of(self, x, y):
+        """ Returns the id of the tile owning each position; positions outside the world are clamped. """
+        ix = np.clip(np.floor((x + self.world_size / 2) / self.tile_w), 0, self.nx - 1).astype(np.int64)
+        iy = np.clip(np.floor((y + self.world_size / 2) / self.tile_h), 0, self.ny - 1).astype(np.int64)
+        return iy * self.nx + ix
+
+    def extent(self, tile):
+        """ Returns (min_x, min_y, max_x, max_y) of a tile. """
+        ix, iy = tile % self.nx, tile // self.nx
+        min_x = -self.world_size / 2 + ix * self.tile_w
+        min_y = -self.world_size / 2 + iy * self.tile_h
+        return min_x, min_y, min_x + self.tile_w, min_y + self.tile_h
+
+    def border(self, tile, bounds, halo):
+        """
+        Finds the entities of a tile that other tiles may need as ghosts.
+
+        Args:
+            tile (int): The tile owning the entities.
+            bounds (np.ndarray): An (n, 4) array of entity bounding boxes.
+            halo (float): Width of the shared border strip.
+
+        Returns:
+            np.ndarray: A boolean mask of the entities within `halo` of an edge the tile
+                shares with another tile; the outer edges of the world are never shared.
+        """
+        min_x, min_y, max_x, max_y = self.extent(tile)
+        ix, iy = tile % self.nx, tile // self.nx
+        return (
+            ((bounds[:, 0] < min_x + halo) & (ix > 0)) | ((bounds[:, 2] > max_x - halo) & (ix < self.nx - 1)) |
+            ((bounds[:, 1] < min_y + halo) & (iy > 0)) | ((bounds[:, 3] > max_y - halo) & (iy < self.ny - 1))
+        )
+
+    def near(self, tile, bounds, halo):
+        """ Returns a boolean mask of the bounding boxes within `halo` of a tile. """
+        min_x, min_y, max_x, max_y = self.extent(tile)
+        return ((bounds[:, 2] > min_x - halo) & (bounds[:, 0] < max_x + halo) &
+                (bounds[:, 3] > min_y - halo) & (bounds[:, 1] < max_y + halo))
+
+    def reachable(self, tile, halo):
+        """ Returns the ids of the other tiles lying within `halo` of a tile. """
+        extents = np.array([self.extent(other) for other in range(len(self))])
+        return [other for other in np.flatnonzero(self.near(tile, extents, halo)).tolist() if other != tile]
+
+
+def _tile_step(game, tile, layout, exchange, barrier, halo, fps):
+    """ Runs one synchronised step of a tile: halo exchange, local step, migration. """
+    table = game.entities
+
+    # Publish the border entities of this tile
+    own = table.active()
+    border = layout.border(tile, table.bounds(own), halo)
+    exchange.write("halo", tile, table.pack(own[border]))
+    barrier.wait()
+
+    # Step with the border entities of other tiles that can reach this one as ghosts;
+    # ghosts replay their owner's movement, so the sweep sees where they go this step
+    ghosts = []
+    for other in layout.reachable(tile, halo):
+        records = exchange.read("halo", other)
+        ghosts.append(records[layout.near(tile, _record_bounds(records), halo)])
+    ghosts = table.spawn_records(np.concatenate(ghosts)) if ghosts else np.empty(0, dtype=np.int64)
+    table.ghost[ghosts] = True
+    game.step(fps)
+    table.despawn(ghosts)
+
+    # Hand over the entities that left the tile
+    own = table.active()
+    leaving = own[layout.tile_of(table.x[own], table.y[own]) != tile]
+    exchange.write("migrants", tile, table.pack(leaving))
+    table.despawn(leaving)
+    barrier.wait()
+
+    for other in range(len(layout)):
+        if other == tile:
+            continue
+        records = exchange.read("migrants", other)
+        arriving = layout.tile_of(records[:, 1], records[:, 2]) == tile
+        table.spawn_records(records[arriving])
+    barrier.wait()
+
+
+def _tile_worker(tile, layout, seed, settings, records, conn, barrier, exchange_name):
+    """ Process entry point owning one tile of the world. """
+    exchange = _Exchange(exchange_name, len(layout))
+    np.random.seed(None if seed is None else seed + tile)
+
+    game = GameObject(None, world_size=layout.world_size, **settings)
+    game.area = layout.tile_w * layout.tile_h
+    game.entities.spawn_records(records)
+
+    try:
+        while True:
+            command, *args = conn.recv()
+            if command == "step":
+                fps, steps, halo = args
+                for _ in range(steps):
+                    _tile_step(game, tile, layout, exchange, barrier, halo, fps)
+                conn.send(("ok", None))
+            elif command == "gather":
+                conn.send(("ok", game.entities.pack(game.entities.active())))
+            elif command == "stop":
+                conn.send(("ok", None))
+                break
+    except BrokenBarrierError:
+        conn.send(("error", f"Tile {tile} stopped because another tile failed"))
+    except Exception as error:
+        barrier.abort()
+        conn.send(("error", f"Tile {tile}: {error!r}"))
+    finally:
+        exchange.close()
+
+
+class TiledWorld:
+    """
+    Runs a single world split into spatial tiles, one worker process per tile.
+
+    Every step, each tile publishes the entities near its border to shared memory; the
+    tiles within the halo add them as ghosts, which move along with their owner, so that
+    collisions across tile edges are seen from both sides. After the local step, entities
+    that crossed into another tile are migrated to their new owner through the same
+    shared block.
+    """
+
+    def __init__(self, game: GameObject, tiles: tuple = (2, 2), halo: float = None,
+                 capacity: int = None, seed: int = None):
+        """
+        Partitions the entities of a game into tiles.
+
+        The game itself is left untouched; use `gather` to read the distributed state back.
+        Every tile is stepped with the game's `ecology` and `swept` settings.
+
+        Args:
+            game (GameObject): The world to partition.
+            tiles (tuple, optional): Number of tiles along x and y.
+            halo (float, optional): Width of the border strip shared with neighbouring tiles.
+                Defaults to what entities can cover in one step at the fps given to `step`:
+                twice the largest entity extent plus twice the largest movement of a step.
+            capacity (int, optional): Initial number of records per tile in each shared
+                outbox. Defaults to twice the largest number of entities a tile has in its
+                border strip at the start; an outbox that overflows is moved to a segment
+                twice as large, or as large as needed.
+            seed (int, optional): Base seed for the per-tile random generators.
+        """
+        self.layout = _TileLayout(game.world_size, tiles)
+
+        table = game.entities
+        slots = table.active()
+        bounds = table.bounds(slots)
+        self._extent = np.max(bounds[:, 2:] - bounds[:, :2]) if len(slots) else 1.0
+        self._speed = np.max(table.target_speed[slots]) if len(slots) else 0.0
+        self.halo = halo
+        self.seed = seed
+        self.settings = {"ecology": game.ecology, "swept": game.swept}
+
+        records = table.pack(slots)
+        owners = self.layout.tile_of(records[:, 1], records[:, 2])
+        self._initial = [records[owners == tile] for tile in range(len(self.layout))]
+
+        if capacity is None:
+            # Migrants come from the border strip as well, so its size bounds both outboxes
+            halo = self.halo if self.halo is not None else self.step_halo(1)
+            border = max(np.count_nonzero(self.layout.border(tile, bounds[owners == tile], halo))
+                         for tile in range(len(self.layout)))
+            capacity = max(256, 2 * border)
+        self.capacity = capacity
+        self._workers = []
+        self._conns = []
+        self._exchange = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """ Creates the shared exchange and starts one process per tile. """
+        tiles = len(self.layout)
+        self._exchange = _Exchange(tiles=tiles, capacity=self.capacity)
+        barrier = mp.Barrier(tiles)
+
+        for tile in range(tiles):
+            parent, child = mp.Pipe()
+            worker = mp.Process(
+                target=_tile_worker,
+                args=(tile, self.layout, self.seed, self.settings,
+                      self._initial[tile], child, barrier, self._exchange.name),
+                daemon=True,
+            )
+            worker.start()
+            child.close()
+            self._workers.append(worker)
+            self._conns.append(parent)
+        self._initial = None
+
+    def _broadcast(self, *message):
+        """
+        Sends a command to every worker and collects their replies.
+
+        Raises:
+            RuntimeError: If a worker failed or died. When a worker dies, the others are
+                terminated: they would wait for it at the barrier forever, and a worker
+                killed inside the barrier can leave it locked, so it cannot be aborted.
+        """
+        lost = []
+        for tile, conn in enumerate(self._conns):
+            try:
+                conn.send(message)
+            except OSError:
+                lost.append(tile)
+
+        replies = {}
+        pending = set(range(len(self._conns))) - set(lost)
+        while pending and not lost:
+            waiting = {self._conns[tile]: tile for tile in pending}
+            waiting.update({self._workers[tile].sentinel: tile for tile in pending})
+            for ready in wait(list(waiting)):
+                tile = waiting[ready]
+                if tile not in pending:
+                    continue
+                pending.discard(tile)
+                conn = self._conns[tile]
+                try:
+                    # A worker that exits right after replying is ready on both handles
+                    if ready is not conn and not conn.poll():
+                        raise EOFError
+                    replies[tile] = conn.recv()
+                except EOFError:
+                    lost.append(tile)
+
+        errors = []
+        for tile in sorted(lost):
+            self._workers[tile].join(timeout=1)
+            errors.append(f"Tile {tile} died (exit code {self._workers[tile].exitcode})")
+        if lost and pending:
+            for tile in pending:
+                self._workers[tile].terminate()
+            errors.append("the other tiles were terminated")
+        errors += [payload for status, payload in replies.values() if status == "error"]
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return [replies[tile][1] for tile in range(len(self._conns))]
+
+    def step_halo(self, fps):
+        """
+        Returns the width of the border strip for steps at a given fps.
+
+        Two entities can only meet during a step if the gap between them is at most what
+        both can move in it, so the strip covers the largest movement twice, plus the
+        largest entity extent twice as a margin for collision pushes.
+
+        Args:
+            fps (int): The frames per second for movement calculations.
+
+        Raises:
+            ValueError: If a fixed `halo` was given and is narrower than that.
+        """
+        reach = 2 * self._extent + 2 * self._speed * (60 / fps)
+        if self.halo is None:
+            return reach
+        if self.halo < reach:
+            raise ValueError(f"halo {self.halo} is narrower than the {reach:.2f} entities can cover in one step at {fps} fps")
+        return self.halo
+
+    def step(self, fps, steps: int = 1):
+        """
+        Advances every tile in lockstep.
+
+        Args:
+            fps (int): The frames per second for movement calculations.
+            steps (int, optional): Number of frames to run.
+        """
+        self._broadcast("step", fps, steps, self.step_halo(fps))
+
+    def gather(self):
+        """
+        Collects the entities of every tile.
+
+        Returns:
+            EntityTable: A new table holding the whole world.
+        """
+        return EntityTable.from_records(np.concatenate(self._broadcast("gather")))
+
+    def close(self):
+        """ Stops the workers and releases the shared memory. """
+        if self._workers:
+            try:
+                self._broadcast("stop")
+            except RuntimeError:
+                pass
+            for worker in self._workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+            for conn in self._conns:
+                conn.close()
+        self._workers, self._conns = [], []
+
+        if self._exchange is not None:
+            self._exchange.close(unlink=True)
+            self._exchange = None
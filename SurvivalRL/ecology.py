@@ -0,0 +1,121 @@
+import numpy as np
+
+from SurvivalRL import Config
+from SurvivalRL.entities import HERBIVORE, PLANT
+
+
+def forage(table, i, j, dt):
+    """
+    Moves energy from plants to the herbivores touching them.
+
+    A plant shared by several herbivores is split evenly between them, and never gives
+    away more energy than it has.
+
+    Args:
+        table (EntityTable): The entity storage.
+        i (np.ndarray): Slots of the first entity of each colliding pair.
+        j (np.ndarray): Slots of the second entity of each colliding pair.
+        dt (float): Length of the step in seconds.
+
+    Returns:
+        int: The number of herbivore-plant contacts.
+    """
+    herbivore_first = (table.kind[i] == HERBIVORE) & (table.kind[j] == PLANT)
+    plant_first = (table.kind[i] == PLANT) & (table.kind[j] == HERBIVORE)
+    eaters = np.concatenate([i[herbivore_first], j[plant_first]])
+    plants = np.concatenate([j[herbivore_first], i[plant_first]])
+
+    if len(plants) == 0:
+        return 0
+
+    demand = Config.EAT_RATE * dt
+    total_demand = np.bincount(plants, minlength=table.capacity)[plants] * demand
+    bite = demand * np.minimum(1.0, np.maximum(table.energy[plants], 0.0) / total_demand)
+
+    np.add.at(table.energy, eaters, bite)
+    np.subtract.at(table.energy, plants, bite)
+    return len(plants)
+
+
+def metabolise(table, slots, dt, area):
+    """
+    Burns herbivore energy and regrows plants.
+
+    Plant growth slows down linearly as the plant population approaches the carrying
+    capacity of the area they live in (`Config.PLANT_DENSITY` per unit of area).
+
+    Args:
+        table (EntityTable): The entity storage.
+        slots (np.ndarray): Slots of the entities to update.
+        dt (float): Length of the step in seconds.
+        area (float): Area covered by the entities, the whole world or one tile of it.
+    """
+    kind = table.kind[slots]
+    herbivores = slots[kind == HERBIVORE]
+    plants = slots[kind == PLANT]
+
+    table.energy[herbivores] -= Config.HERBIVORE_METABOLISM * dt
+
+    capacity = Config.PLANT_DENSITY * area
+    crowding = max(0.0, 1.0 - len(plants) / capacity)
+    table.energy[plants] += Config.PLANT_GROWTH * crowding * dt
+
+
+def divide(table, parents, world_size):
+    """
+    Splits entities in two.
+
+    The child is a copy of its parent placed right next to it, and the parent's energy
+    is shared equally between both.
+
+    Args:
+        table (EntityTable): The entity storage.
+        parents (np.ndarray): Slots of the dividing entities.
+        world_size (float): Edge length of the square world, children are kept inside it.
+
+    Returns:
+        np.ndarray: The slots of the children.
+    """
+    parents = np.asarray(parents, dtype=np.int64)
+    if len(parents) == 0:
+        return parents
+
+    table.energy[parents] /= 2
+    children = table.spawn_records(table.pack(parents))
+
+    angle = np.random.uniform(0, 2 * np.pi, len(children))
+    gap = 2 * table.radius[children] + np.maximum(table.width[children], table.height[children])
+    half = world_size / 2
+    table.x[children] = np.clip(table.x[children] + np.cos(angle) * gap, -half, half)
+    table.y[children] = np.clip(table.y[children] + np.sin(angle) * gap, -half, half)
+    table.vx[children] = 0
+    table.vy[children] = 0
+    return children
+
+
+def lifecycle(table, slots, world_size):
+    """
+    Removes starved entities and divides the ones above their division threshold.
+
+    Args:
+        table (EntityTable): The entity storage.
+        slots (np.ndarray): Slots of the entities to update.
+        world_size (float): Edge length of the square world.
+
+    Returns:
+        tuple: Slots of the entities born and of the entities that died.
+    """
+    kind = table.kind[slots]
+    energy = table.energy[slots]
+    living = (kind == HERBIVORE) | (kind == PLANT)
+
+    starved = living & (energy <= 0)
+    died = slots[starved]
+    table.despawn(died)
+
+    ready = ~starved & (
+        ((kind == HERBIVORE) & (energy >= Config.HERBIVORE_DIVISION_ENERGY)) |
+        ((kind == PLANT) & (energy >= Config.PLANT_DIVISION_ENERGY))
+    )
+    born = divide(table, slots[ready], world_size)
+    return born, died
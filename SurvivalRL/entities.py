@@ -0,0 +1,206 @@
+import sys
+
+import numpy as np
+
+
+# Entity kinds stored in `EntityTable.kind`
+CIRCLE = 0
+RECTANGLE = 1
+HERBIVORE = 2
+PLANT = 3
+
+
+class EntityTable:
+    """
+    Structure-of-arrays storage for every entity in a world.
+
+    Each entity owns one row (slot) across all columns. Despawned slots are recycled by
+    later spawns, so the slot of a live entity never changes. All spawns and despawns are
+    done in bulk on index arrays.
+
+    Positions follow the object conventions: circles are stored by their centre,
+    rectangles by their bottom-left corner.
+    """
+
+    # Columns copied into packed records, in record order (after the kind)
+    FIELDS = ("x", "y", "radius", "width", "height",
+              "target_x", "target_y", "target_speed", "rotation", "vx", "vy", "energy")
+    RECORD_WIDTH = len(FIELDS) + 1
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initializes an empty table.
+
+        Args:
+            capacity (int, optional): Number of slots allocated up front.
+        """
+        self.capacity = 0
+        self.size = 0  # High-water mark of used slots
+        self.kind = np.empty(0, dtype=np.int8)
+        self.alive = np.empty(0, dtype=bool)
+        self.ghost = np.empty(0, dtype=bool)  # Read-only copies of entities owned elsewhere
+        for field in self.FIELDS:
+            setattr(self, field, np.empty(0, dtype=np.float64))
+        self._free = []
+        self._grow(capacity)
+
+    def __len__(self):
+        """ Returns the number of live entities. """
+        return self.size - len(self._free)
+
+    def _grow(self, capacity):
+        """ Reallocates every column to hold at least `capacity` slots. """
+        if capacity <= self.capacity:
+            return
+        capacity = max(capacity, 2 * self.capacity)
+
+        for field in ("kind", "alive", "ghost") + self.FIELDS:
+            old = getattr(self, field)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    @property
+    def nbytes(self):
+        """ Memory held by the columns and the free-slot list, in bytes. """
+        columns = sum(getattr(self, field).nbytes for field in ("kind", "alive", "ghost") + self.FIELDS)
+        return columns + sys.getsizeof(self._free) + 28 * len(self._free)
+
+    def active(self):
+        """
+        Lists the slots of all live entities.
+
+        Returns:
+            np.ndarray: Slot indices in ascending order.
+        """
+        return np.flatnonzero(self.alive[:self.size])
+
+    def owned(self):
+        """
+        Lists the slots of all live entities that are not ghosts.
+
+        Returns:
+            np.ndarray: Slot indices in ascending order.
+        """
+        return np.flatnonzero(self.alive[:self.size] & ~self.ghost[:self.size])
+
+    def spawn(self, kind, x, y, **fields):
+        """
+        Adds entities to the table.
+
+        Every argument is broadcast against `x`, so a scalar spawns one entity and
+        arrays spawn many at once. Columns that are not given are zero.
+
+        Args:
+            kind (int | np.ndarray): Entity kind(s).
+            x (float | np.ndarray): Initial x-coordinate(s).
+            y (float | np.ndarray): Initial y-coordinate(s).
+            **fields: Initial values for any other column in `FIELDS`.
+
+        Returns:
+            np.ndarray: The slots of the new entities.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        count = len(x)
+
+        reused = np.array(self._free[-count:] if count else [], dtype=np.int64)
+        del self._free[len(self._free) - len(reused):]
+        fresh = np.arange(self.size, self.size + count - len(reused))
+        self._grow(self.size + len(fresh))
+        self.size += len(fresh)
+        slots = np.concatenate([reused, fresh])
+
+        self.kind[slots] = kind
+        self.alive[slots] = True
+        self.ghost[slots] = False
+        for field in self.FIELDS:
+            getattr(self, field)[slots] = 0.0
+        self.x[slots] = x
+        self.y[slots] = y
+        for field, value in fields.items():
+            getattr(self, field)[slots] = value
+        return slots
+
+    def despawn(self, slots):
+        """
+        Removes entities from the table.
+
+        Args:
+            slots (np.ndarray): Slots of the entities to remove.
+        """
+        slots = np.unique(np.asarray(slots, dtype=np.int64))
+        slots = slots[self.alive[slots]]
+        self.alive[slots] = False
+        self._free.extend(slots.tolist())
+
+    def bounds(self, slots):
+        """
+        Computes axis-aligned bounding boxes.
+
+        Args:
+            slots (np.ndarray): Slots of the entities.
+
+        Returns:
+            np.ndarray: An (n, 4) array of [min_x, min_y, max_x, max_y].
+        """
+        r = self.radius[slots]
+        x, y = self.x[slots], self.y[slots]
+        return np.column_stack([x - r, y - r, x + r + self.width[slots], y + r + self.height[slots]])
+
+    def centers(self, slots):
+        """
+        Computes the centre of each entity.
+
+        Args:
+            slots (np.ndarray): Slots of the entities.
+
+        Returns:
+            tuple: Two arrays with the x and y centre coordinates.
+        """
+        return self.x[slots] + self.width[slots] / 2, self.y[slots] + self.height[slots] / 2
+
+    def pack(self, slots):
+        """
+        Copies entities into flat float64 records.
+
+        Args:
+            slots (np.ndarray): Slots of the entities.
+
+        Returns:
+            np.ndarray: An (n, RECORD_WIDTH) array, the kind first and then `FIELDS`.
+        """
+        records = np.empty((len(slots), self.RECORD_WIDTH), dtype=np.float64)
+        records[:, 0] = self.kind[slots]
+        for column, field in enumerate(self.FIELDS, start=1):
+            records[:, column] = getattr(self, field)[slots]
+        return records
+
+    def spawn_records(self, records):
+        """
+        Spawns entities from records built by `pack`.
+
+        Args:
+            records (np.ndarray): An (n, RECORD_WIDTH) array.
+
+        Returns:
+            np.ndarray: The slots of the new entities.
+        """
+        records = np.asarray(records, dtype=np.float64).reshape(-1, self.RECORD_WIDTH)
+        fields = {field: records[:, column] for column, field in enumerate(self.FIELDS, start=1)}
+        return self.spawn(records[:, 0].astype(np.int8), **fields)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Builds a new table holding the given records.
+
+        Args:
+            records (np.ndarray): An (n, RECORD_WIDTH) array.
+
+        Returns:
+            EntityTable: The filled table.
+        """
+        table = cls(capacity=max(64, len(records)))
+        table.spawn_records(records)
+        return table
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CollisionEvents:
+    """
+    All collisions resolved during one step, as parallel arrays with one entry per pair.
+
+    The normal points from `j` to `i`. Pairs stopped at their time of impact by the
+    swept test only touch and have a depth of 0.
+    """
+
+    i: np.ndarray
+    j: np.ndarray
+    normal_x: np.ndarray
+    normal_y: np.ndarray
+    depth: np.ndarray
+    kind_i: np.ndarray
+    kind_j: np.ndarray
+
+    @classmethod
+    def empty(cls):
+        """ Returns a step without collisions. """
+        none = np.empty(0)
+        slots = np.empty(0, dtype=np.int64)
+        kinds = np.empty(0, dtype=np.int8)
+        return cls(slots, slots, none, none, none, kinds, kinds)
+
+    def __len__(self):
+        return len(self.i)
+
+    def of_kinds(self, kind_a, kind_b):
+        """
+        Selects the pairs between two kinds, in either order.
+
+        Args:
+            kind_a (int): Kind of one side of the pair.
+            kind_b (int): Kind of the other side.
+
+        Returns:
+            np.ndarray: A boolean mask over the pairs.
+        """
+        return (((self.kind_i == kind_a) & (self.kind_j == kind_b)) |
+                ((self.kind_i == kind_b) & (self.kind_j == kind_a)))
+
+    def flags(self, capacity):
+        """
+        Marks every slot that took part in a collision.
+
+        Args:
+            capacity (int): Length of the returned array, usually the table capacity.
+
+        Returns:
+            np.ndarray: A boolean array indexed by slot.
+        """
+        flags = np.zeros(capacity, dtype=bool)
+        flags[self.i] = True
+        flags[self.j] = True
+        return flags
+
+    def counts(self, capacity):
+        """
+        Counts the collisions of every slot.
+
+        Args:
+            capacity (int): Length of the returned array, usually the table capacity.
+
+        Returns:
+            np.ndarray: An int array indexed by slot.
+        """
+        return np.bincount(self.i, minlength=capacity) + np.bincount(self.j, minlength=capacity)
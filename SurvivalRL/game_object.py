@@ -1,42 +1,282 @@
-from collections import defaultdict
-from SurvivalRL import Config
+import sys
+import time
+
+import numpy as np
+
+from SurvivalRL import Config, SpatialHash, ecology
+from SurvivalRL.events import CollisionEvents
+from SurvivalRL.entities import EntityTable, CIRCLE, RECTANGLE, HERBIVORE, PLANT
+from SurvivalRL.physics import move_towards, sample_targets, narrowphase, resolve, sweep
 
 
 class GameObject:
-    """ 
+    """
     Manages all objects in the game.
     This class is responsible for handling multiple objects, updating their states, and rendering them on a given matplotlib axis.
+
+    The state of every entity lives in `self.entities`, and each step is computed on those
+    arrays. Objects added with `add_object` are handles onto rows of that table and are
+    only used for drawing; their artists exist only while a renderer (axis) is attached.
     """
 
-    def __init__(self, ax):
+    # Object class and colour used for entities that were spawned without an object
+    OBJECT_STYLES = {
+        CIRCLE: ("Circle", "gray"),
+        RECTANGLE: ("Rectangle", "orange"),
+        HERBIVORE: ("Herbivore", "blue"),
+        PLANT: ("Plant", "green"),
+    }
+
+    def __init__(self, ax, world_size: float = Config.WINDOW_SIZE, ecology: bool = True, swept: bool = True):
         """
         Initializes the GameObject manager.
 
         Args:
             ax (matplotlib.axes.Axes): The axis where objects will be drawn and managed.
+                Pass None to run the world headless.
+            world_size (float, optional): Edge length of the square world, centred on the origin.
+            ecology (bool, optional): Whether herbivores and plants eat, grow, divide and starve.
+            swept (bool, optional): Whether collisions are tested along the whole movement of a
+                frame rather than only at its end, so fast movers cannot pass through each other
+                at large steps (low fps).
         """
         self.ax = ax
+        self.world_size = world_size
+        self.area = world_size ** 2  # Area the plants' carrying capacity applies to, one tile in TiledWorld
+        self.ecology = ecology
+        self.swept = swept
+        self.entities = EntityTable()
         self.objects = []
-        self.grid = defaultdict(list)
+        self.grid = SpatialHash()
+        self.collisions = CollisionEvents.empty()  # Collisions of the last step
+        self.collided = np.zeros(0, dtype=bool)  # Per-slot flags derived from them
+        self.controller = None  # Set by ControlInterface
+        self.telemetry = None  # Set by TelemetryLog
+        self._born = []
+        self._died = []
         self.grid_lines = []
-        self.draw_grid()
+        self._grid_cell_size = None
+        if ax is not None:
+            self.draw_grid()
 
     def add_object(self, obj):
         """
-        Adds an object to the game and draws it on the axis.
+        Adds an object to the game and draws it on the axis, if a renderer is attached.
 
         Args:
             obj (Obj): An instance of a game object (e.g., Circle, Rectangle).
         """
-        obj.draw()
+        if self.ax is not None:
+            obj.draw()
         self.objects.append(obj)
 
     def draw_grid(self):
-        """ Draws the spatial grid on the figure. """
-        for x in range(-Config.WINDOW_SIZE // 2, Config.WINDOW_SIZE // 2 + 1, Config.GRID_SIZE):
-            self.ax.axvline(x, color="gray", linestyle="--", linewidth=0.5)
-        for y in range(-Config.WINDOW_SIZE // 2, Config.WINDOW_SIZE // 2 + 1, Config.GRID_SIZE):
-            self.ax.axhline(y, color="gray", linestyle="--", linewidth=0.5)
+        """ Draws the cells of the spatial hash on the figure, replacing the lines drawn before. """
+        for line in self.grid_lines:
+            line.remove()
+        self.grid_lines = []
+
+        half, cell_size = self.world_size / 2, self.grid.cell_size
+        for edge in np.arange(np.ceil(-half / cell_size), np.floor(half / cell_size) + 1) * cell_size:
+            self.grid_lines.append(self.ax.axvline(edge, color="gray", linestyle="--", linewidth=0.5))
+            self.grid_lines.append(self.ax.axhline(edge, color="gray", linestyle="--", linewidth=0.5))
+        self._grid_cell_size = cell_size
+
+    def attach_renderer(self, ax):
+        """
+        Starts drawing the game on an axis.
+
+        Every live entity gets an object, and every object gets its artists.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axis to draw on.
+        """
+        self.detach_renderer()
+        self.ax = ax
+        self.draw_grid()
+
+        known = {obj.index for obj in self.objects}
+        for slot in self.entities.owned().tolist():
+            if slot not in known:
+                self.objects.append(self._make_object(slot))
+        for obj in self.objects:
+            obj.draw()
+
+    def detach_renderer(self):
+        """ Removes every artist and stops drawing; the objects themselves are kept. """
+        if self.ax is None:
+            return
+        for obj in self.objects:
+            obj.remove()
+        for line in self.grid_lines:
+            line.remove()
+        self.grid_lines = []
+        self.ax = None
+
+    def _make_object(self, slot, name=None):
+        """ Creates an undrawn object for an entity spawned in bulk. """
+        import Objects
+
+        class_name, colour = self.OBJECT_STYLES[int(self.entities.kind[slot])]
+        return getattr(Objects, class_name).attach(self, slot, colour, name)
+
+    def retarget(self, slots):
+        """
+        Gives the entities new random targets within a reasonable distance.
+
+        Args:
+            slots (np.ndarray): Slots of the entities to retarget.
+        """
+        sample_targets(self.entities, slots, self.world_size, Config.MIN_TARGET_DISTANCE)
+
+    def step(self, fps):
+        """
+        Advances the simulation by one frame without touching any artist.
+
+        The collisions resolved during the frame are left in `self.collisions`, and the
+        slots that took part in one are flagged in `self.collided`.
+
+        Args:
+            fps (int): The frames per second for movement calculations.
+        """
+        started = time.perf_counter()
+        table = self.entities
+        slots = table.active()
+
+        # Movement, policy-driven agents keep the targets they were given; ghosts replay
+        # the movement of their owner in another tile but never pick a target themselves
+        movers = slots[table.target_speed[slots] > 0]
+        prev_x, prev_y = table.x[movers].copy(), table.y[movers].copy()
+        autonomous = np.ones(table.capacity, dtype=bool)
+        steered = movers
+
+        if self.controller is not None:
+            autonomous[self.controller.apply(fps)] = False
+            if self.controller.mode == "velocity":
+                steered = movers[autonomous[movers]]
+
+        reached = steered[move_towards(table, steered, table.target_speed[steered] * (60 / fps))]
+        reached = reached[~table.ghost[reached]]
+        self.retarget(reached[autonomous[reached]])
+
+        # Collisions, the broadphase covers the swept area of every mover
+        disp_x = np.zeros(table.capacity)
+        disp_y = np.zeros(table.capacity)
+        disp_x[movers] = table.x[movers] - prev_x
+        disp_y[movers] = table.y[movers] - prev_y
+
+        bounds = table.bounds(slots)
+        if self.swept:
+            shift = np.column_stack([disp_x[slots], disp_y[slots]] * 2)
+            bounds[:, :2] = np.minimum(bounds[:, :2], bounds[:, :2] - shift[:, :2])
+            bounds[:, 2:] = np.maximum(bounds[:, 2:], bounds[:, 2:] - shift[:, 2:])
+        self.grid.rebuild(bounds)
+        i, j = self.grid.candidate_pairs()
+        i, j = slots[i], slots[j]
+
+        if self.swept:
+            # Rewind movers that would have passed through something to their time of impact
+            toi, swept_x, swept_y = sweep(table, i, j, disp_x, disp_y)
+            impact = (toi > 0) & (toi <= 1)
+            earliest = np.ones(table.capacity)
+            np.minimum.at(earliest, i[impact], toi[impact])
+            np.minimum.at(earliest, j[impact], toi[impact])
+            table.x -= disp_x * (1 - earliest)
+            table.y -= disp_y * (1 - earliest)
+
+            # A pair only touches when each of its movers was stopped by this impact, not an earlier one
+            moved = (disp_x != 0) | (disp_y != 0)
+            impact &= (~moved[i] | (earliest[i] == toi)) & (~moved[j] | (earliest[j] == toi))
+
+        hit, normal_x, normal_y, depth = narrowphase(table, i, j)
+        if self.swept:
+            # Pairs stopped at first contact only touch, they collide with no depth
+            touched = impact & ~hit
+            normal_x[touched], normal_y[touched], depth[touched] = swept_x[touched], swept_y[touched], 0.0
+            hit |= impact
+        i, j = i[hit], j[hit]
+        normal_x, normal_y, depth = normal_x[hit], normal_y[hit], depth[hit]
+        resolve(table, i, j, normal_x, normal_y, depth)
+        self.collisions = CollisionEvents(i, j, normal_x, normal_y, depth, table.kind[i], table.kind[j])
+
+        bumped = np.union1d(i, j)
+        self.retarget(bumped[(table.target_speed[bumped] > 0) & ~table.ghost[bumped] & autonomous[bumped]])
+
+        # Heading of everything that moved this frame
+        table.vx[movers] = table.x[movers] - prev_x
+        table.vy[movers] = table.y[movers] - prev_y
+        heading = np.hypot(table.vx[movers], table.vy[movers]) > 0.01
+        turned = movers[heading]
+        table.rotation[turned] = np.degrees(np.arctan2(table.vy[turned], table.vx[turned]))
+
+        # Survival dynamics; ghosts take part in foraging but never divide or die here
+        if self.ecology:
+            dt = 1 / fps
+            owned = table.owned()
+            ecology.forage(table, self.collisions.i, self.collisions.j, dt)
+            ecology.metabolise(table, owned, dt, self.area)
+            born, died = ecology.lifecycle(table, owned, self.world_size)
+            self.retarget(born[table.target_speed[born] > 0])
+            self._track(born, died)
+
+        self.collided = self.collisions.flags(table.capacity)
+
+        if self.controller is not None:
+            self.controller.observe()
+
+        if self.telemetry is not None:
+            self.telemetry.record(fps, len(reached), time.perf_counter() - started)
+
+    def divide(self, slots):
+        """
+        Splits entities in two, sharing their energy with the new copies.
+
+        Args:
+            slots (np.ndarray): Slots of the dividing entities.
+
+        Returns:
+            np.ndarray: The slots of the new entities.
+        """
+        born = ecology.divide(self.entities, slots, self.world_size)
+        self.retarget(born[self.entities.target_speed[born] > 0])
+        self._track(born, np.empty(0, dtype=np.int64))
+        return born
+
+    def _track(self, born, died):
+        """
+        Keeps the objects in step with births and deaths.
+
+        Without an axis no objects are made for newborns, so the objects of dead entities
+        are dropped at once; with one, both are queued until `update` draws them.
+        """
+        if self.ax is None:
+            if len(died) and self.objects:
+                dead = set(died.tolist())
+                self.objects = [obj for obj in self.objects if obj.index not in dead]
+        elif len(born) or len(died):
+            self._born.append(born)
+            self._died.append(died)
+
+    def _sync_objects(self):
+        """ Drops the objects of entities that died and creates objects for newborn ones. """
+        if not self._born:
+            return
+
+        died = np.concatenate(self._died)
+        born = np.concatenate(self._born)
+        self._born, self._died = [], []
+
+        if len(died):
+            dead = set(died.tolist())
+            for obj in self.objects:
+                if obj.index in dead:
+                    obj.remove()
+            self.objects = [obj for obj in self.objects if obj.index not in dead]
+
+        if self.ax is None:
+            return
+        for slot in np.unique(born[self.entities.alive[born]]).tolist():
+            self.add_object(self._make_object(slot, "Clone Cell"))
 
     def update(self, fps):
         """
@@ -45,13 +285,41 @@ class GameObject:
         Returns:
             list: A list of updated shapes for animation rendering.
         """
-        self.grid.clear()
+        self.step(fps)
+        self._sync_objects()
 
-        for obj in self.objects:
-            cell_x, cell_y = obj.get_grid_cell()
-            self.grid[(cell_x, cell_y)].append(obj)
+        if self.ax is None:
+            return []
 
+        if self.grid.cell_size != self._grid_cell_size:
+            self.draw_grid()
         for obj in self.objects:
             obj.update(fps, self.grid)
 
-        return [obj.shape for obj in self.objects]
\ No newline at end of file
+        return [obj.shape for obj in self.objects]
+
+    def memory_usage(self):
+        """
+        Measures the memory held by the simulation state, excluding matplotlib artists.
+
+        Returns:
+            dict: Bytes used by the entity table, the spatial hash, the collisions of the last
+                step, the objects and in total, plus `bytes_per_entity` over the live entities.
+        """
+        objects = sum(sys.getsizeof(obj) + sys.getsizeof(obj.pos) for obj in self.objects)
+        usage = {
+            "entities": self.entities.nbytes,
+            "grid": self.grid.nbytes + self.collided.nbytes,
+            "collisions": sum(column.nbytes for column in vars(self.collisions).values()),
+            "objects": objects + sys.getsizeof(self.objects),
+        }
+        usage["total"] = sum(usage.values())
+        usage["bytes_per_entity"] = usage["total"] / max(1, len(self.entities))
+        return usage
+
+    def bytes_per_entity(self):
+        """
+        Returns:
+            float: Simulation memory per live entity, see `memory_usage`.
+        """
+        return self.memory_usage()["bytes_per_entity"]
@@ -0,0 +1,244 @@
+import numpy as np
+
+from SurvivalRL.entities import RECTANGLE
+
+
+def move_towards(table, slots, max_speed):
+    """
+    Moves entities toward their targets using an ease-in-out function.
+
+    This is the array form of `Position.move_towards`.
+
+    Args:
+        table (EntityTable): The entity storage.
+        slots (np.ndarray): Slots of the entities to move.
+        max_speed (np.ndarray): Maximum movement speed of each entity.
+
+    Returns:
+        np.ndarray: A boolean mask of the entities that had already reached their target.
+    """
+    direction_x = table.target_x[slots] - table.x[slots]
+    direction_y = table.target_y[slots] - table.y[slots]
+    distance = np.hypot(direction_x, direction_y)
+
+    reached = distance < 0.1
+
+    # Ease In-Out interpolation: slow start, fast middle, slow end
+    ease_factor = np.clip(distance / 5, 0.1, 1.0)
+    speed = np.where(reached, 0.0, max_speed * ease_factor / np.where(reached, 1.0, distance))
+
+    table.x[slots] += direction_x * speed
+    table.y[slots] += direction_y * speed
+    return reached
+
+
+def sample_targets(table, slots, world_size, min_distance):
+    """
+    Draws new random targets inside the world, away from the current positions.
+
+    Args:
+        table (EntityTable): The entity storage.
+        slots (np.ndarray): Slots of the entities that need a new target.
+        world_size (float): Edge length of the square world, centred on the origin.
+        min_distance (float): Minimum distance between an entity and its new target. It is
+            capped at a quarter of the world size, which leaves most of a small world to
+            draw from even for an entity at its centre.
+    """
+    pending = np.asarray(slots, dtype=np.int64)
+    min_distance = min(min_distance, world_size / 4)
+
+    while len(pending):
+        new_x = np.random.uniform(-world_size / 2, world_size / 2, len(pending))
+        new_y = np.random.uniform(-world_size / 2, world_size / 2, len(pending))
+        accepted = np.hypot(new_x - table.x[pending], new_y - table.y[pending]) > min_distance
+
+        table.target_x[pending[accepted]] = new_x[accepted]
+        table.target_y[pending[accepted]] = new_y[accepted]
+        pending = pending[~accepted]
+
+
+def _circle_box(cx, cy, radius, x0, y0, x1, y1):
+    """
+    Circle against axis-aligned box test.
+
+    Returns:
+        tuple: Hit mask, the normal pointing from the box to the circle, and the depth.
+    """
+    nearest_x = np.clip(cx, x0, x1)
+    nearest_y = np.clip(cy, y0, y1)
+    dx, dy = cx - nearest_x, cy - nearest_y
+    distance = np.hypot(dx, dy)
+    outside = distance > 0
+
+    safe = np.where(outside, distance, 1.0)
+    normal_x, normal_y = dx / safe, dy / safe
+    depth = radius - distance
+
+    # Centre inside the box: push out through the nearest face
+    faces = np.stack([cx - x0, x1 - cx, cy - y0, y1 - cy])
+    face = np.argmin(faces, axis=0)
+    inside_x = np.choose(face, [-1.0, 1.0, 0.0, 0.0])
+    inside_y = np.choose(face, [0.0, 0.0, -1.0, 1.0])
+
+    normal_x = np.where(outside, normal_x, inside_x)
+    normal_y = np.where(outside, normal_y, inside_y)
+    depth = np.where(outside, depth, np.min(faces, axis=0) + radius)
+    return depth > 0, normal_x, normal_y, depth
+
+
+def narrowphase(table, i, j):
+    """
+    Exact overlap test for candidate pairs.
+
+    Circles are tested against circles, rectangles by their axis-aligned box.
+
+    Args:
+        table (EntityTable): The entity storage.
+        i (np.ndarray): Slots of the first entity of each pair.
+        j (np.ndarray): Slots of the second entity of each pair.
+
+    Returns:
+        tuple: Hit mask, the contact normal (pointing from j to i) and the penetration depth.
+    """
+    cxi, cyi = table.centers(i)
+    cxj, cyj = table.centers(j)
+    rect_i = table.kind[i] == RECTANGLE
+    rect_j = table.kind[j] == RECTANGLE
+
+    hit = np.zeros(len(i), dtype=bool)
+    normal_x = np.zeros(len(i))
+    normal_y = np.zeros(len(i))
+    depth = np.zeros(len(i))
+
+    # Circle-to-Circle
+    pairs = ~rect_i & ~rect_j
+    if np.any(pairs):
+        dx, dy = cxi[pairs] - cxj[pairs], cyi[pairs] - cyj[pairs]
+        distance = np.hypot(dx, dy)
+        safe = np.where(distance > 0, distance, 1.0)
+        reach = table.radius[i[pairs]] + table.radius[j[pairs]]
+        hit[pairs] = distance < reach
+        normal_x[pairs] = np.where(distance > 0, dx / safe, 1.0)
+        normal_y[pairs] = dy / safe
+        depth[pairs] = reach - distance
+
+    # Circle-to-Rectangle, in either order
+    for circle, box, pairs, sign in ((i, j, ~rect_i & rect_j, 1.0), (j, i, rect_i & ~rect_j, -1.0)):
+        if not np.any(pairs):
+            continue
+        c, b = circle[pairs], box[pairs]
+        cx, cy = table.centers(c)
+        found, nx, ny, d = _circle_box(cx, cy, table.radius[c], table.x[b], table.y[b],
+                                       table.x[b] + table.width[b], table.y[b] + table.height[b])
+        hit[pairs], normal_x[pairs], normal_y[pairs], depth[pairs] = found, sign * nx, sign * ny, d
+
+    # Rectangle-to-Rectangle, along the axis of least overlap
+    pairs = rect_i & rect_j
+    if np.any(pairs):
+        a, b = i[pairs], j[pairs]
+        overlap_x = np.minimum(table.x[a] + table.width[a], table.x[b] + table.width[b]) - np.maximum(table.x[a], table.x[b])
+        overlap_y = np.minimum(table.y[a] + table.height[a], table.y[b] + table.height[b]) - np.maximum(table.y[a], table.y[b])
+        along_x = overlap_x < overlap_y
+        hit[pairs] = (overlap_x > 0) & (overlap_y > 0)
+        normal_x[pairs] = np.where(along_x, np.where(cxi[pairs] >= cxj[pairs], 1.0, -1.0), 0.0)
+        normal_y[pairs] = np.where(along_x, 0.0, np.where(cyi[pairs] >= cyj[pairs], 1.0, -1.0))
+        depth[pairs] = np.minimum(overlap_x, overlap_y)
+
+    return hit, normal_x, normal_y, depth
+
+
+def resolve(table, i, j, normal_x, normal_y, depth):
+    """
+    Separates colliding pairs by pushing each entity half the depth along the normal.
+
+    Pushes from several contacts on the same entity are summed.
+
+    Args:
+        table (EntityTable): The entity storage.
+        i (np.ndarray): Slots of the first entity of each pair.
+        j (np.ndarray): Slots of the second entity of each pair.
+        normal_x (np.ndarray): Contact normal x, pointing from j to i.
+        normal_y (np.ndarray): Contact normal y, pointing from j to i.
+        depth (np.ndarray): Penetration depth.
+    """
+    bounce_x = normal_x * depth * 0.5
+    bounce_y = normal_y * depth * 0.5
+
+    np.add.at(table.x, i, bounce_x)
+    np.add.at(table.y, i, bounce_y)
+    np.add.at(table.x, j, -bounce_x)
+    np.add.at(table.y, j, -bounce_y)
+
+
+def sweep(table, i, j, disp_x, disp_y):
+    """
+    Continuous collision test over the last movement of candidate pairs.
+
+    Each pair is tested in the frame of `j`: the centre of `i` travels along the relative
+    displacement from where both started the frame. Circle pairs are solved exactly;
+    pairs involving a rectangle are tested against the box grown by the other's radius
+    and half extents, which is exact for two boxes and slightly conservative at the
+    rounded corners of a circle-box pair.
+
+    Args:
+        table (EntityTable): The entity storage, holding the end-of-movement positions.
+        i (np.ndarray): Slots of the first entity of each pair.
+        j (np.ndarray): Slots of the second entity of each pair.
+        disp_x (np.ndarray): Displacement of every slot during the movement, x part.
+        disp_y (np.ndarray): Displacement of every slot during the movement, y part.
+
+    Returns:
+        tuple: Time of impact as a fraction of the movement (inf when the pair never
+            touches, 0 when it already overlapped at the start), and the contact normal
+            pointing from j to i.
+    """
+    cxi, cyi = table.centers(i)
+    cxj, cyj = table.centers(j)
+    dx = disp_x[i] - disp_x[j]
+    dy = disp_y[i] - disp_y[j]
+    px = (cxi - disp_x[i]) - (cxj - disp_x[j])
+    py = (cyi - disp_y[i]) - (cyj - disp_y[j])
+
+    toi = np.full(len(i), np.inf)
+    normal_x = np.zeros(len(i))
+    normal_y = np.zeros(len(i))
+    rect_i = table.kind[i] == RECTANGLE
+    rect_j = table.kind[j] == RECTANGLE
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Circle-to-Circle: smallest root of |p + d t| = r_i + r_j
+        pairs = ~rect_i & ~rect_j
+        reach = table.radius[i[pairs]] + table.radius[j[pairs]]
+        a = dx[pairs] ** 2 + dy[pairs] ** 2
+        b = 2 * (px[pairs] * dx[pairs] + py[pairs] * dy[pairs])
+        c = px[pairs] ** 2 + py[pairs] ** 2 - reach ** 2
+        root = (-b - np.sqrt(b ** 2 - 4 * a * c)) / (2 * a)
+        t = np.where(c <= 0, 0.0, np.where((a > 0) & (root >= 0), root, np.inf))
+        toi[pairs] = t
+        normal_x[pairs] = (px[pairs] + dx[pairs] * t) / reach
+        normal_y[pairs] = (py[pairs] + dy[pairs] * t) / reach
+
+        # Anything with a box: ray against the Minkowski-grown box (slab method)
+        pairs = rect_i | rect_j
+        ext_x = (table.width[i] + table.width[j]) / 2 + table.radius[i] + table.radius[j]
+        ext_y = (table.height[i] + table.height[j]) / 2 + table.radius[i] + table.radius[j]
+
+        near, far = [], []
+        for p, d, ext in ((px, dx, ext_x), (py, dy, ext_y)):
+            low, high = (-ext - p) / d, (ext - p) / d
+            still = d == 0
+            inside = np.abs(p) < ext
+            near.append(np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(low, high)))
+            far.append(np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(low, high)))
+
+        t_near = np.maximum(near[0], near[1])
+        t_far = np.minimum(far[0], far[1])
+        entered = (t_near <= t_far) & (t_far >= 0)
+        t = np.where(entered, np.maximum(t_near, 0.0), np.inf)
+        along_x = near[0] >= near[1]
+
+        toi[pairs] = t[pairs]
+        normal_x[pairs] = np.where(along_x, np.sign(px + dx * t), 0.0)[pairs]
+        normal_y[pairs] = np.where(along_x, 0.0, np.sign(py + dy * t))[pairs]
+
+    return toi, np.nan_to_num(normal_x), np.nan_to_num(normal_y)
@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class Recorder:
+    """
+    Records the drawable state of a game, one frame per call to `capture`.
+
+    Only what a renderer needs is kept: the kind, geometry and collision flag of every
+    live entity. Frames are concatenated and saved as a compressed `.npz` file that
+    `Recording.load` reads back.
+    """
+
+    COLUMNS = ("x", "y", "radius", "width", "height", "rotation")
+
+    def __init__(self, game):
+        """
+        Initializes an empty recording of a game.
+
+        Args:
+            game (GameObject): The game to record.
+        """
+        self.game = game
+        self._kinds = []
+        self._states = []
+        self._collided = []
+
+    def __len__(self):
+        return len(self._states)
+
+    def capture(self):
+        """ Appends the current state of the game as a new frame. """
+        table = self.game.entities
+        slots = table.owned()
+
+        self._kinds.append(table.kind[slots].copy())
+        self._states.append(np.column_stack([getattr(table, column)[slots] for column in self.COLUMNS]).astype(np.float32))
+        collided = self.game.collided
+        self._collided.append(collided[slots] if len(collided) >= table.capacity else np.zeros(len(slots), dtype=bool))
+
+    def save(self, path, fps: int):
+        """
+        Writes the recorded frames to a compressed `.npz` file.
+
+        Args:
+            path (str): Output file path.
+            fps (int): Frame rate the game was stepped at.
+        """
+        counts = np.array([len(kind) for kind in self._kinds], dtype=np.int64)
+        np.savez_compressed(
+            path,
+            offsets=np.concatenate([[0], np.cumsum(counts)]),
+            kind=np.concatenate(self._kinds) if self._kinds else np.empty(0, dtype=np.int8),
+            state=np.concatenate(self._states) if self._states else np.empty((0, len(self.COLUMNS)), dtype=np.float32),
+            collided=np.concatenate(self._collided) if self._collided else np.empty(0, dtype=bool),
+            world_size=self.game.world_size,
+            fps=fps,
+        )
+
+
+class Recording:
+    """ A sequence of frames saved by `Recorder`. """
+
+    def __init__(self, offsets, kind, state, collided, world_size, fps):
+        self.offsets = offsets
+        self.kind = kind
+        self.state = state
+        self.collided = collided
+        self.world_size = float(world_size)
+        self.fps = int(fps)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a recording from disk.
+
+        Args:
+            path (str): Path of a file written by `Recorder.save`.
+
+        Returns:
+            Recording: The loaded recording.
+        """
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in ("offsets", "kind", "state", "collided", "world_size", "fps")})
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def frame(self, index):
+        """
+        Returns one frame.
+
+        Args:
+            index (int): Frame number.
+
+        Returns:
+            dict: The entity kinds, the `Recorder.COLUMNS` as separate arrays and the collision flags.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        frame = {column: self.state[start:end, i] for i, column in enumerate(Recorder.COLUMNS)}
+        frame["kind"] = self.kind[start:end]
+        frame["collided"] = self.collided[start:end]
+        return frame
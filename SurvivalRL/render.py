@@ -0,0 +1,221 @@
+"""
+Offline rendering of recorded runs.
+
+Frames are split into contiguous chunks rendered by a pool of processes with the Agg
+backend; each worker writes its frames as PNG files, which are then stitched in order
+into a GIF (Pillow) or an MP4 (ffmpeg). Frames meant for a GIF are quantized to a
+palette by the workers already, leaving only the encoding to the stitching process.
+
+    $ python3 -m SurvivalRL.render run.npz result.gif --workers 8
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+from multiprocessing import Pool
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import EllipseCollection, PolyCollection
+from matplotlib.figure import Figure
+
+from SurvivalRL import Config
+from SurvivalRL.entities import CIRCLE, RECTANGLE, HERBIVORE, PLANT
+from SurvivalRL.recording import Recording
+
+
+KIND_COLOURS = {CIRCLE: "gray", RECTANGLE: "orange", HERBIVORE: "blue", PLANT: "green"}
+FRAME_NAME = "frame_{:06d}.png"
+
+
+def _colours(kind, collided):
+    colours = np.array([KIND_COLOURS[k] for k in range(len(KIND_COLOURS))], dtype=object)[kind]
+    colours[collided] = "red"
+    return list(colours)
+
+
+def _rectangle_corners(frame, rects):
+    """ Corners of the rotated rectangles, rotated around their centres as in `Rectangle.apply_rotation`. """
+    hw, hh = frame["width"][rects] / 2, frame["height"][rects] / 2
+    cx, cy = frame["x"][rects] + hw, frame["y"][rects] + hh
+    angle = np.radians(frame["rotation"][rects])
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+
+    corners = np.empty((len(rects), 4, 2))
+    for corner, (sx, sy) in enumerate(((-1, -1), (1, -1), (1, 1), (-1, 1))):
+        corners[:, corner, 0] = cx + cos_a * sx * hw - sin_a * sy * hh
+        corners[:, corner, 1] = cy + sin_a * sx * hw + cos_a * sy * hh
+    return corners
+
+
+def draw_frame(ax, frame, world_size):
+    """
+    Draws one recorded frame on an empty axis.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axis to draw on.
+        frame (dict): A frame returned by `Recording.frame`.
+        world_size (float): Edge length of the recorded world.
+    """
+    half = world_size / 2
+    ax.set_xlim(-half, half)
+    ax.set_ylim(-half, half)
+    ax.set_aspect("equal")
+
+    step = max(Config.GRID_SIZE, world_size / 8)
+    for line in np.arange(-half, half + step / 2, step):
+        ax.axvline(line, color="gray", linestyle="--", linewidth=0.5)
+        ax.axhline(line, color="gray", linestyle="--", linewidth=0.5)
+
+    kind, collided = frame["kind"], frame["collided"]
+    rects = np.flatnonzero(kind == RECTANGLE)
+    circles = np.flatnonzero(kind != RECTANGLE)
+
+    if len(circles):
+        diameter = 2 * frame["radius"][circles]
+        ax.add_collection(EllipseCollection(
+            diameter, diameter, np.zeros(len(circles)), units="xy",
+            offsets=np.column_stack([frame["x"][circles], frame["y"][circles]]),
+            offset_transform=ax.transData,
+            facecolors=_colours(kind[circles], collided[circles]),
+        ))
+    if len(rects):
+        ax.add_collection(PolyCollection(
+            _rectangle_corners(frame, rects),
+            facecolors=_colours(kind[rects], collided[rects]),
+        ))
+
+
+def render_chunk(path, frames, out_dir, dpi=100, size=(6.4, 4.8), palette=False):
+    """
+    Renders a range of frames of a recording to PNG files, in a worker process.
+
+    Args:
+        path (str): Path of the recording.
+        frames (range): Frame numbers to render.
+        out_dir (str): Directory the PNG files are written to.
+        dpi (int, optional): Resolution of the images.
+        size (tuple, optional): Figure size in inches.
+        palette (bool, optional): Quantizes the frames to an adaptive palette, as GIF
+            frames need, so that the process stitching them only has to encode them.
+
+    Returns:
+        list: Paths of the written files, in frame order.
+    """
+    recording = Recording.load(path)
+    fig = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    written = []
+    for index in frames:
+        ax.clear()
+        draw_frame(ax, recording.frame(index), recording.world_size)
+        file = os.path.join(out_dir, FRAME_NAME.format(index))
+        if palette:
+            from PIL import Image
+
+            fig.canvas.draw()
+            image = Image.fromarray(np.asarray(fig.canvas.buffer_rgba()))
+            image.convert("P", palette=Image.ADAPTIVE).save(file)
+        else:
+            fig.savefig(file, dpi=dpi)
+        written.append(file)
+    return written
+
+
+def _stitch_gif(files, output, fps):
+    """ Writes palette frames rendered by `render_chunk` as an animated GIF. """
+    from PIL import Image
+
+    def load(file):
+        image = Image.open(file)
+        image.load()
+        # The palette carries the alpha of the opaque figure, which the GIF writer rejects
+        image.info.pop("transparency", None)
+        return image
+
+    load(files[0]).save(output, save_all=True, append_images=map(load, files[1:]), duration=1000 / fps, loop=0)
+
+
+def _stitch_mp4(files, output, fps):
+    """ Pipes the given PNG frames, and only those, to ffmpeg. """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("Writing MP4 files requires ffmpeg on the PATH")
+    command = [ffmpeg, "-y", "-loglevel", "error", "-f", "image2pipe", "-framerate", str(fps), "-i", "-",
+               "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", output]
+
+    with subprocess.Popen(command, stdin=subprocess.PIPE, bufsize=0) as process:
+        try:
+            for file in files:
+                with open(file, "rb") as frame:
+                    shutil.copyfileobj(frame, process.stdin)
+        except BrokenPipeError:
+            pass  # ffmpeg stopped early, its exit status is raised below
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+
+def render_recording(path, output, workers: int = None, fps: int = None, dpi: int = 100, frames_dir: str = None):
+    """
+    Renders a recording to a GIF or MP4 file using a pool of processes.
+
+    Args:
+        path (str): Path of a recording written by `Recorder.save`.
+        output (str): Output file, its extension (.gif or .mp4) selects the format.
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+        fps (int, optional): Frame rate of the output. Defaults to the recorded one.
+        dpi (int, optional): Resolution of the frames.
+        frames_dir (str, optional): Directory to keep the PNG frames in. A temporary
+            directory is used and removed when omitted. Only the frames of this render
+            are stitched, whatever else the directory holds.
+
+    Raises:
+        ValueError: If the output format is not supported or the recording is empty.
+    """
+    extension = os.path.splitext(output)[1].lower()
+    if extension not in (".gif", ".mp4"):
+        raise ValueError(f"Unsupported output format {extension!r}, use .gif or .mp4")
+
+    recording = Recording.load(path)
+    count = len(recording)
+    if count == 0:
+        raise ValueError(f"{path} contains no frames")
+    fps = fps or recording.fps
+    workers = max(1, min(workers or os.cpu_count(), count))
+
+    bounds = np.linspace(0, count, workers + 1).astype(int)
+    chunks = [range(start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        out_dir = frames_dir or scratch
+        os.makedirs(out_dir, exist_ok=True)
+
+        with Pool(workers) as pool:
+            parts = pool.starmap(render_chunk, [(path, chunk, out_dir, dpi, (6.4, 4.8), extension == ".gif")
+                                                for chunk in chunks])
+        files = [file for part in parts for file in part]
+
+        if extension == ".gif":
+            _stitch_gif(files, output, fps)
+        else:
+            _stitch_mp4(files, output, fps)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a recorded SurvivalRL run in parallel.")
+    parser.add_argument("recording", help="Recording (.npz) written by Recorder.save")
+    parser.add_argument("output", help="Output .gif or .mp4 file")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: CPU count)")
+    parser.add_argument("--fps", type=int, default=None, help="Output frame rate (default: recorded rate)")
+    parser.add_argument("--dpi", type=int, default=100, help="Frame resolution")
+    parser.add_argument("--frames-dir", default=None, help="Keep the PNG frames in this directory")
+    args = parser.parse_args(argv)
+
+    render_recording(args.recording, args.output, args.workers, args.fps, args.dpi, args.frames_dir)
+
+
+if __name__ == "__main__":
+    main()
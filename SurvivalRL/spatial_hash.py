@@ -0,0 +1,229 @@
+import numpy as np
+
+from SurvivalRL import Config
+
+
+_LOW_MASK = np.int64(0xFFFFFFFF)
+_CANDIDATE_SCALES = (1.0, 1.5, 2.0, 3.0, 4.0, 6.0)
+_TUNE_SAMPLE = 4096
+
+
+def pack_keys(cell_x, cell_y):
+    """
+    Packs integer cell coordinates into single int64 keys.
+
+    The upper 32 bits hold the x cell and the lower 32 bits hold the y cell,
+    so any cell within +/- 2**31 of the origin gets a unique key.
+
+    Args:
+        cell_x (np.ndarray): Integer x cell coordinates.
+        cell_y (np.ndarray): Integer y cell coordinates.
+
+    Returns:
+        np.ndarray: The packed int64 keys.
+    """
+    cell_x = np.asarray(cell_x, dtype=np.int64)
+    cell_y = np.asarray(cell_y, dtype=np.int64)
+    return (cell_x << 32) | (cell_y & _LOW_MASK)
+
+
+def unpack_keys(keys):
+    """
+    Recovers the cell coordinates from keys built by `pack_keys`.
+
+    Args:
+        keys (np.ndarray): Packed int64 keys.
+
+    Returns:
+        tuple: Two int64 arrays with the x and y cell coordinates.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    cell_y = keys & _LOW_MASK
+    cell_y = np.where(cell_y >= 2**31, cell_y - 2**32, cell_y)
+    return keys >> 32, cell_y
+
+
+def _cell_spans(bounds, cell_size):
+    """ Returns the first/last cell covered by each bounding box along both axes. """
+    cells = np.floor(bounds / cell_size).astype(np.int64)
+    return cells[:, 0], cells[:, 1], cells[:, 2], cells[:, 3]
+
+
+def _expand_cells(bounds, cell_size):
+    """
+    Lists every (entity, cell) pair covered by the bounding boxes.
+
+    Entities larger than one cell are inserted into every cell they overlap.
+
+    Returns:
+        tuple: Entity indices and the packed key of each covered cell.
+    """
+    x0, y0, x1, y1 = _cell_spans(bounds, cell_size)
+    span_x = x1 - x0 + 1
+    counts = span_x * (y1 - y0 + 1)
+
+    owners = np.repeat(np.arange(len(bounds)), counts)
+    starts = np.cumsum(counts) - counts
+    local = np.arange(counts.sum()) - np.repeat(starts, counts)
+    span_x = np.repeat(span_x, counts)
+
+    cell_x = np.repeat(x0, counts) + local % span_x
+    cell_y = np.repeat(y0, counts) + local // span_x
+    return owners, pack_keys(cell_x, cell_y)
+
+
+def _group_pairs(group_sizes):
+    """
+    Enumerates every unordered pair inside consecutive groups.
+
+    Args:
+        group_sizes (np.ndarray): Size of each group in a flat, grouped array.
+
+    Returns:
+        tuple: Flat positions (left, right) of each pair, with left < right.
+    """
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    positions = np.arange(group_sizes.sum())
+    group_end = np.repeat(group_starts + group_sizes, group_sizes)
+    later = group_end - positions - 1
+
+    left = np.repeat(positions, later)
+    first = np.cumsum(later) - later
+    right = np.arange(later.sum()) - np.repeat(first, later) + left + 1
+    return left, right
+
+
+class SpatialHash:
+    """
+    A sparse spatial hash over axis-aligned bounding boxes.
+
+    Only occupied cells are stored. Cells are addressed by int64 keys packed from the
+    integer cell coordinates, and the table is kept as sorted arrays so that building
+    and querying it are vectorised. Entities whose bounding box spans several cells
+    are inserted into each of them.
+
+    The cell size can be tuned from the live population: candidate sizes around the
+    typical entity extent are scored by the number of cell insertions plus the number
+    of candidate pairs they would produce, and the cheapest one is kept.
+    """
+
+    def __init__(self, cell_size: float = Config.GRID_SIZE, auto_tune: bool = Config.GRID_AUTO_TUNE,
+                 retune_interval: int = Config.GRID_RETUNE_INTERVAL):
+        """
+        Initializes an empty spatial hash.
+
+        Args:
+            cell_size (float): Initial edge length of a cell.
+            auto_tune (bool): Whether `rebuild` re-tunes the cell size from the population.
+            retune_interval (int): Number of rebuilds between two tuning passes.
+        """
+        self.cell_size = float(cell_size)
+        self.auto_tune = auto_tune
+        self.retune_interval = retune_interval
+
+        self._rebuilds = 0
+        self._tuned_count = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        self._starts = np.zeros(1, dtype=np.int64)
+        self._items = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        """ Returns the number of occupied cells. """
+        return len(self._keys)
+
+    @property
+    def nbytes(self):
+        """ Memory held by the cell table, in bytes. """
+        return self._keys.nbytes + self._starts.nbytes + self._items.nbytes
+
+    def rebuild(self, bounds):
+        """
+        Rebuilds the hash from scratch.
+
+        Args:
+            bounds (np.ndarray): An (n, 4) array of [min_x, min_y, max_x, max_y] per entity.
+                Entities are identified by their row index.
+        """
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+
+        if self.auto_tune and self._needs_tuning(len(bounds)):
+            self.tune(bounds)
+        self._rebuilds += 1
+
+        owners, keys = _expand_cells(bounds, self.cell_size)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+
+        is_first = np.ones(len(keys), dtype=bool)
+        is_first[1:] = keys[1:] != keys[:-1]
+
+        self._keys = keys[is_first]
+        self._starts = np.append(np.flatnonzero(is_first), len(keys))
+        self._items = owners[order]
+
+    def _needs_tuning(self, count):
+        """ Re-tunes periodically, or sooner when the population size changes by 2x. """
+        if count == 0:
+            return False
+        if self._tuned_count == 0 or self._rebuilds % self.retune_interval == 0:
+            return True
+        return count > 2 * self._tuned_count or 2 * count < self._tuned_count
+
+    def tune(self, bounds):
+        """
+        Picks the cell size that minimises the estimated broadphase cost.
+
+        Args:
+            bounds (np.ndarray): An (n, 4) array of entity bounding boxes.
+
+        Returns:
+            float: The selected cell size.
+        """
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        count = len(bounds)
+        if count == 0:
+            return self.cell_size
+
+        sample = bounds
+        if count > _TUNE_SAMPLE:
+            sample = bounds[np.random.choice(count, _TUNE_SAMPLE, replace=False)]
+        fraction = len(sample) / count
+
+        extents = np.maximum(sample[:, 2] - sample[:, 0], sample[:, 3] - sample[:, 1])
+        base = np.median(extents)
+        if base <= 0:
+            base = self.cell_size
+
+        best_size, best_cost = self.cell_size, np.inf
+        for size in base * np.asarray(_CANDIDATE_SCALES):
+            _, keys = _expand_cells(sample, size)
+            _, occupancy = np.unique(keys, return_counts=True)
+
+            inserts = len(keys) / fraction
+            pairs = np.sum(occupancy * (occupancy - 1) / 2) / fraction**2
+            cost = inserts + pairs
+
+            if cost < best_cost:
+                best_size, best_cost = float(size), cost
+
+        self.cell_size = best_size
+        self._tuned_count = count
+        return best_size
+
+    def candidate_pairs(self):
+        """
+        Lists every pair of entities sharing at least one cell.
+
+        Returns:
+            tuple: Two int64 arrays (i, j) with i < j, each pair reported once.
+        """
+        sizes = np.diff(self._starts)
+        left, right = _group_pairs(sizes)
+        a, b = self._items[left], self._items[right]
+        i, j = np.minimum(a, b), np.maximum(a, b)
+
+        if len(i):
+            stride = np.int64(self._items.max() + 1)
+            unique = np.unique(i * stride + j)
+            i, j = unique // stride, unique % stride
+        return i, j
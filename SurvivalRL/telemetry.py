@@ -0,0 +1,204 @@
+import glob
+import os
+import queue
+import threading
+import uuid
+
+import numpy as np
+
+
+class TelemetryLog:
+    """
+    Logs aggregate metrics of every step of a game to columnar buffers.
+
+    Each step appends one row: the step number, the simulated time, the population of
+    every entity kind, the number of collisions and of reached targets, the mean speed
+    of the movers and the wall-clock time of the step. Rows are written into arrays
+    preallocated for a chunk of steps; full chunks are handed to a background thread
+    that saves them as compressed `.npz` files, which `Telemetry.load` reads back.
+    """
+
+    KINDS = ("circle", "rectangle", "herbivore", "plant")  # Population columns, by kind
+    COLUMNS = (("step", np.int64), ("time", np.float64)) + tuple((kind, np.int32) for kind in KINDS) + (
+        ("collisions", np.int32), ("reached", np.int32), ("mean_speed", np.float32), ("step_time", np.float32))
+    FILE_NAME = "telemetry_{:06d}.npz"
+    FILE_PATTERN = "telemetry_*.npz"
+
+    def __init__(self, game, directory, chunk_size: int = 10000):
+        """
+        Starts logging the steps of a game.
+
+        Args:
+            game (GameObject): The game to log. Its `telemetry` is set to this log.
+            directory (str): Directory the chunk files are written to. It must not hold
+                the chunks of another run.
+            chunk_size (int, optional): Number of steps per chunk file.
+
+        Raises:
+            FileExistsError: If the directory already holds telemetry chunks.
+        """
+        os.makedirs(directory, exist_ok=True)
+        if glob.glob(os.path.join(directory, self.FILE_PATTERN)):
+            raise FileExistsError(f"{directory} already holds a telemetry log, use an empty directory")
+
+        self.game = game
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.run_id = uuid.uuid4().hex
+
+        self.steps = 0
+        self.time = 0.0
+        self._chunks = 0
+        self._rows = 0
+        self._buffers = self._allocate()
+        self._error = None
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+        game.telemetry = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _allocate(self):
+        return {name: np.zeros(self.chunk_size, dtype=dtype) for name, dtype in self.COLUMNS}
+
+    def record(self, fps, reached, step_time):
+        """
+        Appends the metrics of the step that just ended. Called by `GameObject.step`.
+
+        Args:
+            fps (int): The frames per second the step was computed at.
+            reached (int): Number of entities that reached their target.
+            step_time (float): Wall-clock duration of the step, in seconds.
+        """
+        table = self.game.entities
+        owned = table.owned()
+        population = np.bincount(table.kind[owned], minlength=len(self.KINDS))
+        movers = owned[table.target_speed[owned] > 0]
+        speed = np.hypot(table.vx[movers], table.vy[movers]).mean() * fps if len(movers) else 0.0
+
+        self.steps += 1
+        self.time += 1 / fps
+        row, buffers = self._rows, self._buffers
+        buffers["step"][row] = self.steps
+        buffers["time"][row] = self.time
+        for kind, name in enumerate(self.KINDS):
+            buffers[name][row] = population[kind]
+        buffers["collisions"][row] = len(self.game.collisions)
+        buffers["reached"][row] = reached
+        buffers["mean_speed"][row] = speed
+        buffers["step_time"][row] = step_time
+
+        self._rows += 1
+        if self._rows == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Hands the rows logged so far to the writer thread and starts a new chunk.
+
+        Raises:
+            RuntimeError: If writing an earlier chunk failed.
+        """
+        if self._error is not None:
+            raise RuntimeError("Writing telemetry failed") from self._error
+        if self._rows == 0:
+            return
+
+        path = os.path.join(self.directory, self.FILE_NAME.format(self._chunks))
+        columns = {name: column[:self._rows] for name, column in self._buffers.items()}
+        self._queue.put((path, {**columns, "run_id": np.array(self.run_id)}))
+        self._chunks += 1
+        self._rows = 0
+        self._buffers = self._allocate()
+
+    def _write(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, columns = item
+            try:
+                np.savez_compressed(path, **columns)
+            except Exception as error:
+                self._error = error
+
+    def close(self):
+        """
+        Writes the last partial chunk, waits for the writer thread and detaches from the game.
+
+        Raises:
+            RuntimeError: If writing a chunk failed.
+        """
+        if self._writer.is_alive():
+            try:
+                self.flush()
+            finally:
+                self._queue.put(None)
+                self._writer.join()
+        if self.game.telemetry is self:
+            self.game.telemetry = None
+        if self._error is not None:
+            raise RuntimeError("Writing telemetry failed") from self._error
+
+
+class Telemetry:
+    """ Columns read back from the chunk files written by `TelemetryLog`. """
+
+    def __init__(self, columns, run_id=None):
+        self.columns = columns
+        self.run_id = run_id
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Reads and concatenates every chunk of a telemetry log.
+
+        Args:
+            directory (str): Directory given to `TelemetryLog`.
+
+        Returns:
+            Telemetry: The loaded columns, in step order.
+
+        Raises:
+            ValueError: If the chunks come from more than one run.
+        """
+        files = sorted(glob.glob(os.path.join(directory, TelemetryLog.FILE_PATTERN)))
+        parts = {name: [] for name, _ in TelemetryLog.COLUMNS}
+        run_ids = set()
+        for file in files:
+            with np.load(file) as data:
+                run_ids.add(str(data["run_id"]))
+                for name in parts:
+                    parts[name].append(data[name])
+
+        if len(run_ids) > 1:
+            raise ValueError(f"{directory} mixes the chunks of {len(run_ids)} runs")
+        return cls({name: np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+                    for (name, dtype), chunks in zip(TelemetryLog.COLUMNS, parts.values())},
+                   run_ids.pop() if run_ids else None)
+
+    def __len__(self):
+        return len(self.columns["step"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def plot(self, ax, columns=("herbivore", "plant"), every: int = 1):
+        """
+        Plots columns against the simulated time.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axis to draw on.
+            columns (tuple, optional): Names of the columns to plot.
+            every (int, optional): Plots only every n-th step, for long runs.
+        """
+        time = self.columns["time"][::every]
+        for name in columns:
+            ax.plot(time, self.columns[name][::every], label=name)
+        ax.set_xlabel("time (s)")
+        ax.legend()